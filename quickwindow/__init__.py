@@ -24,3 +24,17 @@
 from .window import *
 from .event import *
 from .quick import * 
+from .gl import *
+from .capture import *
+from .record import *
+from .trace import *
+from .gamepad import *
+from .ipc import *
+from .present import *
+from .vsync import *
+from .latency import *
+from .dispatch import *
+from .stages import *
+from .pool import *
+from .watchdog import *
+from .alloc import *
@@ -0,0 +1,190 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from array import array
+from collections import namedtuple
+from typing import Optional, Callable
+import os
+import sys
+import sysconfig
+import tracemalloc
+
+__all__ = ["AllocationTracker", "FrameAllocations"]
+
+FrameAllocations = namedtuple("FrameAllocations", ["frame", "quickwindow_blocks", "user_blocks", "net_blocks",
+                                                   "quickwindow_bytes", "user_bytes", "peak_bytes"])
+
+_package = os.path.dirname(os.path.abspath(__file__)) + os.sep
+_stdlib = tuple({os.path.abspath(sysconfig.get_path(name)) + os.sep for name in ("stdlib", "platstdlib")})
+
+QUICKWINDOW = "quickwindow"
+USER = "user"
+
+# The innermost frame outside the standard library decides who asked for
+# the memory, so a Queue built in swap_buffers() counts as quickwindow's
+# while user code called from run() stages still counts as the user's
+def _owner(traceback):
+    for frame in reversed(traceback):
+        filename = frame.filename
+        if filename.startswith('<') or filename.startswith(_stdlib):
+            continue
+        return QUICKWINDOW if filename.startswith(_package) else USER
+    return USER
+
+class AllocationTracker:
+    def __init__(self,
+                 capacity: int = 1024,
+                 trace_bytes: bool = False,
+                 nframes: int = 16,
+                 on_frame: Optional[Callable[[FrameAllocations], None]] = None):
+        self.capacity = capacity
+        self.trace_bytes = trace_bytes
+        self.on_frame = on_frame
+        self.frames = 0
+        self.last_frame = None
+        self._frame = array('q', [0]) * capacity
+        self._columns = [array('q', [0]) * capacity for _ in range(6)]
+        self._index = 0
+        self._count = 0
+        self._started_tracemalloc = False
+        self._baseline = None
+        if trace_bytes:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(nframes)
+                self._started_tracemalloc = True
+            self._baseline = self._snapshot()
+        self._blocks = self._bytes = 0
+        self._qw_blocks = self._user_blocks = self._start_blocks = 0
+        self._qw_bytes = self._user_bytes = 0
+        # Kept in an array so the reading does not hold an extra int alive
+        self._start_bytes = array('q', [0])
+        # Reading the counter keeps the previous reading alive, which would
+        # otherwise show up as one block per section
+        first = sys.getallocatedblocks()
+        self._bias = sys.getallocatedblocks() - first
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self._baseline = None
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__, all_frames=True),
+        ))
+
+    def begin(self):
+        self._qw_blocks = self._user_blocks = 0
+        self._qw_bytes = self._user_bytes = 0
+        if self.trace_bytes:
+            tracemalloc.reset_peak()
+            self._bytes = tracemalloc.get_traced_memory()[0]
+            self._start_bytes[0] = self._bytes
+        self._blocks = self._start_blocks = sys.getallocatedblocks()
+
+    # Each section only counts growth, so objects quickwindow allocates while
+    # polling are not cancelled out by the previous frame's being freed at swap
+    def library(self):
+        blocks = sys.getallocatedblocks()
+        delta = blocks - self._blocks - self._bias
+        if delta > 0:
+            self._qw_blocks += delta
+        self._blocks = blocks
+        if self.trace_bytes:
+            current = tracemalloc.get_traced_memory()[0]
+            if current > self._bytes:
+                self._qw_bytes += current - self._bytes
+            self._bytes = current
+
+    def user(self):
+        blocks = sys.getallocatedblocks()
+        delta = blocks - self._blocks - self._bias
+        if delta > 0:
+            self._user_blocks += delta
+        self._blocks = blocks
+        if self.trace_bytes:
+            current = tracemalloc.get_traced_memory()[0]
+            if current > self._bytes:
+                self._user_bytes += current - self._bytes
+            self._bytes = current
+
+    def end(self, frame: int):
+        self.library()
+        peak = 0
+        if self.trace_bytes:
+            peak = tracemalloc.get_traced_memory()[1] - self._start_bytes[0]
+        net = self._blocks - self._start_blocks
+        values = (self._qw_blocks, self._user_blocks, net, self._qw_bytes, self._user_bytes, peak)
+        i = self._index
+        self._frame[i] = frame
+        for column, value in zip(self._columns, values):
+            column[i] = value
+        self._index = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        self.frames += 1
+        self.last_frame = FrameAllocations(frame, *values)
+        if self.on_frame is not None:
+            self.on_frame(self.last_frame)
+
+    def records(self):
+        first = (self._index - self._count) % self.capacity
+        for n in range(self._count):
+            i = (first + n) % self.capacity
+            yield FrameAllocations(self._frame[i], *(column[i] for column in self._columns))
+
+    def summary(self):
+        records = list(self.records())
+        if not records:
+            return {}
+        count = len(records)
+        return {"frames": count,
+                "quickwindow_blocks": sum(r.quickwindow_blocks for r in records) / count,
+                "user_blocks": sum(r.user_blocks for r in records) / count,
+                "net_blocks": sum(r.net_blocks for r in records) / count,
+                "quickwindow_bytes": sum(r.quickwindow_bytes for r in records) / count,
+                "user_bytes": sum(r.user_bytes for r in records) / count,
+                "zero_allocation_frames": sum(1 for r in records
+                                              if r.quickwindow_blocks == 0 and r.user_blocks == 0)}
+
+    # Call sites whose live memory grew since tracking started, as
+    # (owner, "file:line", bytes, blocks); needs trace_bytes
+    def sites(self, limit: int = 10):
+        if self._baseline is None:
+            raise RuntimeError("Allocation sites need AllocationTracker(trace_bytes=True)")
+        diffs = self._snapshot().compare_to(self._baseline, 'traceback')
+        result = []
+        for diff in diffs:
+            if diff.size_diff <= 0 and diff.count_diff <= 0:
+                continue
+            site = diff.traceback[-1]
+            result.append((_owner(diff.traceback), f"{site.filename}:{site.lineno}",
+                           diff.size_diff, diff.count_diff))
+            if len(result) == limit:
+                break
+        return result
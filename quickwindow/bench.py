@@ -0,0 +1,198 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from . import glfw as api
+from .window import init_glfw, Window, ManagedWindow, FrameLimiter
+from time import perf_counter_ns, perf_counter, process_time
+import argparse
+import json
+import platform
+import statistics
+import sys
+import gc
+import weakref
+import tracemalloc
+
+__all__ = ["run_benchmarks"]
+
+def _per_call(func, iterations):
+    start = perf_counter_ns()
+    for _ in range(iterations):
+        func()
+    return (perf_counter_ns() - start) / iterations
+
+def _result(ns_per_op, iterations, **extra):
+    return {"ns_per_op": round(ns_per_op, 2), "iterations": iterations, **extra}
+
+def bench_wcb_dispatch(window, iterations):
+    calls = []
+    callback = Window._wcb(api.GLFWkeyfun, lambda win, *args: calls.append(win))
+    handle = window.handle
+    ns = _per_call(lambda: callback(handle, 65, 38, api.GLFW_PRESS, 0), iterations)
+    if len(calls) != iterations or calls[0] is not window:
+        raise RuntimeError("_wcb dispatch did not reach the window")
+    return _result(ns, iterations)
+
+def bench_enqueue_drain(window, iterations):
+    key_callback = window.key_callback
+    start = perf_counter_ns()
+    for i in range(iterations):
+        key_callback(65, 38, api.GLFW_PRESS, 0)
+    enqueue = perf_counter_ns() - start
+    start = perf_counter_ns()
+    drained = sum(1 for _ in window.events())
+    drain = perf_counter_ns() - start
+    window.swap_buffers()
+    return {"enqueue": _result(enqueue / iterations, iterations),
+            "drain": _result(drain / max(drained, 1), drained)}
+
+def bench_frame(window, iterations, events_per_frame):
+    key_callback = window.key_callback
+    poll, all_events, swap = window.poll_events, window.all_events, window.swap_buffers
+    poll_ns = drain_ns = swap_ns = 0
+    for _ in range(iterations):
+        for _ in range(events_per_frame):
+            key_callback(65, 38, api.GLFW_PRESS, 0)
+        t0 = perf_counter_ns()
+        poll()
+        t1 = perf_counter_ns()
+        all_events()
+        t2 = perf_counter_ns()
+        swap()
+        t3 = perf_counter_ns()
+        poll_ns += t1 - t0
+        drain_ns += t2 - t1
+        swap_ns += t3 - t2
+    return {"poll_events": _result(poll_ns / iterations, iterations),
+            "all_events": _result(drain_ns / iterations, iterations, events_per_frame=events_per_frame),
+            "swap_buffers": _result(swap_ns / iterations, iterations)}
+
+def bench_limiter(fps, frames):
+    limiter = FrameLimiter(fps)
+    limiter.limit()
+    deltas = []
+    wall, cpu = perf_counter(), process_time()
+    for _ in range(frames):
+        deltas.append(limiter.limit())
+    wall, cpu = perf_counter() - wall, process_time() - cpu
+    target = 1.0 / fps
+    # limit() reports the previous frame's delta, so skip the warm-up frame
+    deltas = deltas[1:]
+    return {"target_fps": fps,
+            "frames": frames,
+            "mean_dt": statistics.fmean(deltas),
+            "mean_error": statistics.fmean(d - target for d in deltas),
+            "max_error": max(abs(d - target) for d in deltas),
+            "jitter": statistics.pstdev(deltas),
+            "cpu_usage": cpu / wall}
+
+def bench_ffi(iterations):
+    checked = api.glfwGetTime
+    raw = api._all_functions['glfwGetTime']
+    checked_ns = _per_call(checked, iterations)
+    raw_ns = _per_call(raw, iterations)
+    return {"glfwGetTime": _result(checked_ns, iterations),
+            "glfwGetTime_raw": _result(raw_ns, iterations),
+            "error_check_overhead_ns": round(checked_ns - raw_ns, 2)}
+
+# Opens and closes windows in a loop; fails if closed windows stay
+# registered or reachable, or if dropped ones are never destroyed
+def bench_window_churn(windows):
+    baseline = len(Window._instance_)
+    ManagedWindow(64, 64, "quickwindow churn").close()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    refs = []
+    start = perf_counter_ns()
+    for _ in range(windows):
+        window = ManagedWindow(64, 64, "quickwindow churn")
+        window.add_listener(lambda win, event: None)
+        window.close()
+        refs.append(weakref.ref(window))
+        del window
+    elapsed = perf_counter_ns() - start
+    gc.collect()
+    growth = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    alive = sum(1 for ref in refs if ref() is not None)
+    if len(Window._instance_) != baseline or alive:
+        raise RuntimeError(f"{alive} closed windows leaked, "
+                           f"{len(Window._instance_) - baseline} still registered")
+    # Windows dropped without close() must still be destroyed by GLFW
+    finalizers = []
+    for _ in range(min(windows, 16)):
+        window = ManagedWindow(64, 64, "quickwindow churn")
+        Window.swap_current(None)
+        finalizers.append(window._finalizer)
+        del window
+    gc.collect()
+    undestroyed = sum(1 for finalizer in finalizers if finalizer.alive)
+    if len(Window._instance_) != baseline or undestroyed:
+        raise RuntimeError(f"{undestroyed} dropped windows were never destroyed")
+    return _result(elapsed / windows, windows, bytes_per_window=round(growth / windows, 2))
+
+def run_benchmarks(iterations: int = 100000, frames: int = 600,
+                   fps: int = 120, events_per_frame: int = 16, windows: int = 200):
+    init_glfw()
+    Window.hint(visible=False)
+    window = ManagedWindow(64, 64, "quickwindow bench")
+    try:
+        window.swap_interval(0)
+        results = {
+            "wcb_dispatch": bench_wcb_dispatch(window, iterations),
+            "enqueue_drain": bench_enqueue_drain(window, iterations),
+            "frame": bench_frame(window, frames, events_per_frame),
+            "frame_limiter": bench_limiter(fps, frames),
+            "ffi": bench_ffi(iterations),
+            "window_churn": bench_window_churn(windows),
+        }
+    finally:
+        window.close()
+        Window.hint()
+    return {"python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "glfw": Window.api_version_string(),
+            "results": results}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m quickwindow.bench",
+                                     description="Measure quickwindow dispatch, queueing, limiter and FFI costs")
+    parser.add_argument("-n", "--iterations", type=int, default=100000)
+    parser.add_argument("-f", "--frames", type=int, default=600)
+    parser.add_argument("--fps", type=int, default=120)
+    parser.add_argument("--events-per-frame", type=int, default=16)
+    parser.add_argument("-w", "--windows", type=int, default=200)
+    parser.add_argument("-o", "--output", help="write JSON results to a file instead of stdout")
+    args = parser.parse_args(argv)
+    results = run_benchmarks(args.iterations, args.frames, args.fps, args.events_per_frame, args.windows)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+if __name__ == "__main__":
+    main()
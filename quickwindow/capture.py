@@ -0,0 +1,215 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from .window import Window
+from .gl import (gl_functions, GL_RGBA, GL_UNSIGNED_BYTE, GL_PACK_ALIGNMENT, GL_PIXEL_PACK_BUFFER,
+                 GL_STREAM_READ, GL_MAP_READ_BIT, GL_SYNC_GPU_COMMANDS_COMPLETE,
+                 GL_SYNC_FLUSH_COMMANDS_BIT, GL_TIMEOUT_IGNORED)
+from .shm import attach
+from ctypes import c_uint, c_ubyte
+from multiprocessing import get_context, shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import os
+import struct
+import zlib
+
+__all__ = ["FrameCapture"]
+
+_pack_functions = ('glGenBuffers', 'glDeleteBuffers', 'glBindBuffer', 'glBufferData',
+                   'glMapBufferRange', 'glUnmapBuffer', 'glPixelStorei', 'glReadPixels',
+                   'glFenceSync', 'glClientWaitSync', 'glDeleteSync')
+
+def _png_chunk(tag, data):
+    chunk = tag + data
+    return struct.pack(">I", len(data)) + chunk + struct.pack(">I", zlib.crc32(chunk) & 0xFFFFFFFF)
+
+def _write_png(path, pixels, width, height, level):
+    stride = width * 4
+    rows = bytearray()
+    # GL rows start at the bottom of the framebuffer
+    for y in range(height - 1, -1, -1):
+        rows.append(0)
+        rows += pixels[y * stride:(y + 1) * stride]
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)))
+        f.write(_png_chunk(b"IDAT", zlib.compress(bytes(rows), level)))
+        f.write(_png_chunk(b"IEND", b""))
+
+def _encode_slot(shm_name, offset, width, height, path, level):
+    shm = attach(shm_name)
+    try:
+        pixels = shm.buf[offset:offset + width * height * 4]
+        try:
+            _write_png(path, pixels, width, height, level)
+        finally:
+            pixels.release()
+    finally:
+        shm.close()
+    return path
+
+class FrameCapture:
+    def __init__(self, window: Window, directory: str,
+                 size: Optional[tuple] = None,
+                 buffers: int = 3,
+                 slots: int = 8,
+                 workers: int = 2,
+                 compression: int = 6,
+                 prefix: str = "frame",
+                 block: bool = True):
+        if buffers < 2:
+            raise ValueError("FrameCapture needs at least 2 pack buffers")
+        if slots < 1:
+            raise ValueError("FrameCapture needs at least 1 ring slot")
+        self.window = window
+        self.directory = directory
+        self.compression = compression
+        self.prefix = prefix
+        self.block = block
+        self.frame = 0
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+        with window:
+            self._gl = gl_functions(window).load(*_pack_functions)
+        self._nbuffers = buffers
+        self._pbos = (c_uint * buffers)()
+        self._fences = [None] * buffers
+        self._pending = [None] * buffers
+        self._index = 0
+        self._nslots = slots
+        self._slot = 0
+        self._futures = [None] * slots
+        self._shm = None
+        # Workers start from a fresh interpreter; forking would copy this
+        # process's GL context, display connection and helper threads
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+        self.resize(*(size or window.framebuffer_size))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    @property
+    def frame_bytes(self):
+        return self.width * self.height * 4
+
+    def resize(self, width: int, height: int):
+        if self._shm is not None:
+            self.flush()
+            self._release()
+        self.width = width
+        self.height = height
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, self.frame_bytes * self._nslots))
+        gl = self._gl
+        with self.window:
+            gl.glGenBuffers(self._nbuffers, self._pbos)
+            for pbo in self._pbos:
+                gl.glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+                gl.glBufferData(GL_PIXEL_PACK_BUFFER, self.frame_bytes, None, GL_STREAM_READ)
+            gl.glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+    # Must be called with the window's context current, before swap_buffers()
+    def capture(self):
+        gl = self._gl
+        index = self._index
+        if self._pending[index] is not None:
+            self._drain(index)
+        gl.glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        gl.glBindBuffer(GL_PIXEL_PACK_BUFFER, self._pbos[index])
+        gl.glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        gl.glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._fences[index] = gl.glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self._pending[index] = self.frame
+        self.frame += 1
+        self._index = (index + 1) % self._nbuffers
+
+    def _drain(self, index):
+        gl = self._gl
+        frame = self._pending[index]
+        self._pending[index] = None
+        fence, self._fences[index] = self._fences[index], None
+        if fence:
+            gl.glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, GL_TIMEOUT_IGNORED)
+            gl.glDeleteSync(fence)
+
+        slot = self._slot
+        future = self._futures[slot]
+        if future is not None and not future.done():
+            if not self.block:
+                self.dropped += 1
+                return
+            future.result()
+        self._slot = (slot + 1) % self._nslots
+
+        nbytes = self.frame_bytes
+        gl.glBindBuffer(GL_PIXEL_PACK_BUFFER, self._pbos[index])
+        ptr = gl.glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, nbytes, GL_MAP_READ_BIT)
+        if ptr:
+            offset = slot * nbytes
+            self._shm.buf[offset:offset + nbytes] = memoryview((c_ubyte * nbytes).from_address(ptr)).cast('B')
+            gl.glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        gl.glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        if not ptr:
+            self.dropped += 1
+            self._futures[slot] = None
+            return
+
+        path = os.path.join(self.directory, "%s_%06d.png" % (self.prefix, frame))
+        self._futures[slot] = self._pool.submit(_encode_slot, self._shm.name, offset,
+                                                self.width, self.height, path, self.compression)
+
+    def flush(self):
+        with self.window:
+            for i in range(self._nbuffers):
+                index = (self._index + i) % self._nbuffers
+                if self._pending[index] is not None:
+                    self._drain(index)
+        for future in self._futures:
+            if future is not None:
+                future.result()
+        self._futures = [None] * self._nslots
+
+    def _release(self):
+        with self.window:
+            for i, fence in enumerate(self._fences):
+                if fence:
+                    self._gl.glDeleteSync(fence)
+                self._fences[i] = None
+            self._gl.glDeleteBuffers(self._nbuffers, self._pbos)
+        self._pending = [None] * self._nbuffers
+        self._index = 0
+        self._slot = 0
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def close(self):
+        if self._shm is None:
+            return
+        self.flush()
+        self._release()
+        self._pool.shutdown()
@@ -0,0 +1,115 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from .event import *
+from typing import Optional, Callable, Iterable
+
+__all__ = ["EventDispatcher"]
+
+_subkeys = {
+    KeyEvent:               'key',
+    MouseButtonEvent:       'button',
+    JoystickButtonEvent:    'button',
+    JoystickAxisEvent:      'axis',
+}
+
+class EventDispatcher:
+    def __init__(self):
+        self._handlers = {}
+        self._keyed = {}
+        self._routes = {}
+
+    def on(self, event_type: type, handler: Optional[Callable] = None, key: Optional[int] = None):
+        if handler is None:
+            def decorator(func):
+                self.on(event_type, func, key)
+                return func
+            return decorator
+        if key is None:
+            self._handlers.setdefault(event_type, []).append(handler)
+        else:
+            if event_type not in _subkeys:
+                raise ValueError(f"{event_type.__name__} has no sub-key to dispatch on")
+            self._keyed.setdefault(event_type, {}).setdefault(key, []).append(handler)
+        self._build(event_type)
+        return handler
+
+    def off(self, event_type: type, handler: Callable, key: Optional[int] = None):
+        if key is None:
+            self._handlers.get(event_type, []).remove(handler)
+        else:
+            self._keyed.get(event_type, {}).get(key, []).remove(handler)
+        self._build(event_type)
+
+    def handles(self, event_type: type) -> bool:
+        return event_type in self._routes
+
+    # One compiled route per event type so dispatch is a single dict lookup
+    def _build(self, event_type):
+        handlers = tuple(self._handlers.get(event_type, ()))
+        keyed = {k: tuple(v) for k, v in self._keyed.get(event_type, {}).items() if v}
+        if not handlers and not keyed:
+            self._routes.pop(event_type, None)
+            return
+        # Routes report whether a handler ran, so unmatched keyed events
+        # still reach the window's queue
+        if not keyed:
+            if len(handlers) == 1:
+                handler = handlers[0]
+                def route(event):
+                    handler(event)
+                    return True
+            else:
+                def route(event):
+                    for handler in handlers:
+                        handler(event)
+                    return True
+        else:
+            attr = _subkeys[event_type]
+            def route(event):
+                matched = keyed.get(getattr(event, attr))
+                if matched is None and not handlers:
+                    return False
+                if matched is not None:
+                    for handler in matched:
+                        handler(event)
+                for handler in handlers:
+                    handler(event)
+                return True
+        self._routes[event_type] = route
+
+    def dispatch(self, event: EventType) -> bool:
+        route = self._routes.get(event.__class__)
+        if route is None:
+            return False
+        return route(event)
+
+    # Dispatches `events` and returns those that had no handler
+    def dispatch_all(self, events: Iterable[EventType]):
+        routes = self._routes
+        unhandled = []
+        for event in events:
+            route = routes.get(event.__class__)
+            if route is None or not route(event):
+                unhandled.append(event)
+        return unhandled
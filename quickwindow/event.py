@@ -21,12 +21,13 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-__all__ = ["EventType", "KeyEvent", "CharEvent", "ScrollEvent", "MouseButtonEvent", "CursorEnterEvent", "CursorPosEvent", "WindowSizeEvent", "WindowPosEvent", "WindowCloseEvent", "WindowRefreshEvent", "WindowFocusEvent", "WindowIconifyEvent", "FrameBufferSizeEvent"]
+__all__ = ["EventType", "INPUT_EVENTS", "KeyEvent", "CharEvent", "ScrollEvent", "MouseButtonEvent", "CursorEnterEvent", "CursorPosEvent", "WindowSizeEvent", "WindowPosEvent", "WindowCloseEvent", "WindowRefreshEvent", "WindowFocusEvent", "WindowIconifyEvent", "FrameBufferSizeEvent", "JoystickConnectEvent", "JoystickAxisEvent", "JoystickButtonEvent"]
 
+@dataclass
 class EventType:
-    pass
+    timestamp: float = field(default=0.0, kw_only=True, repr=False, compare=False)
 
 @dataclass
 class KeyEvent(EventType):
@@ -89,3 +90,23 @@ class WindowIconifyEvent(EventType):
 class FrameBufferSizeEvent(EventType):
     width: int
     height: int
+
+@dataclass
+class JoystickConnectEvent(EventType):
+    joystick: int
+    status: bool
+
+@dataclass
+class JoystickAxisEvent(EventType):
+    joystick: int
+    axis: int
+    value: float
+
+@dataclass
+class JoystickButtonEvent(EventType):
+    joystick: int
+    button: int
+    action: int
+
+INPUT_EVENTS = frozenset((KeyEvent, CharEvent, ScrollEvent, MouseButtonEvent, CursorEnterEvent,
+                          CursorPosEvent, JoystickAxisEvent, JoystickButtonEvent))
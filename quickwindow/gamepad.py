@@ -0,0 +1,163 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from . import glfw as api
+from .window import JoystickPoller
+from typing import Optional, Union, Callable, Dict, Iterable
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+__all__ = ["Gamepads"]
+
+_NPADS = api.GLFW_JOYSTICK_LAST + 1
+_NBUTTONS = api.GLFW_GAMEPAD_BUTTON_LAST + 1
+_NAXES = api.GLFW_GAMEPAD_AXIS_LAST + 1
+
+class Gamepads:
+    def __init__(self,
+                 deadzone: float = 0.15,
+                 trigger_deadzone: float = 0.05,
+                 curve: Union[float, Callable] = 1.0,
+                 mapping: Optional[Dict[int, int]] = None):
+        self.deadzone = deadzone
+        self.trigger_deadzone = trigger_deadzone
+        self.curve = curve
+        self._states = (api.GLFWgamepadstate * _NPADS)()
+        self._remap = list(range(_NBUTTONS))
+        if mapping:
+            self.set_mapping(mapping)
+        self.present = [False] * _NPADS
+        if np is not None:
+            dtype = np.dtype([('buttons', np.uint8, _NBUTTONS), ('axes', np.float32, _NAXES)], align=True)
+            raw = np.frombuffer(self._states, dtype=dtype)
+            # Views straight onto the ctypes structs filled by glfwGetGamepadState
+            self._raw_buttons = raw['buttons']
+            self._raw_axes = raw['axes']
+            self.sticks = np.zeros((_NPADS, 2, 2), dtype=np.float32)
+            self.triggers = np.zeros((_NPADS, 2), dtype=np.float32)
+            self.buttons = np.zeros((_NPADS, _NBUTTONS), dtype=bool)
+            self._mask = np.zeros(_NPADS, dtype=bool)
+        else:
+            self.sticks = [[[0.0, 0.0], [0.0, 0.0]] for _ in range(_NPADS)]
+            self.triggers = [[0.0, 0.0] for _ in range(_NPADS)]
+            self.buttons = [[False] * _NBUTTONS for _ in range(_NPADS)]
+        # Pads plugged in later are picked up by the joystick callback
+        JoystickPoller._watch()
+        JoystickPoller._watchers_.add(self)
+        self.refresh()
+
+    def set_mapping(self, mapping: Dict[int, int]):
+        remap = list(range(_NBUTTONS))
+        for source, target in mapping.items():
+            remap[target] = source
+        self._remap = remap
+
+    def refresh(self, joysticks: Optional[Iterable[int]] = None):
+        if joysticks is None:
+            joysticks = range(_NPADS)
+        present = [False] * _NPADS
+        for joy in joysticks:
+            present[joy] = bool(api.glfwJoystickIsGamepad(joy))
+        self.present = present
+        if np is not None:
+            self._mask[:] = present
+
+    def _on_joystick(self, joy, connected):
+        present = connected and bool(api.glfwJoystickIsGamepad(joy))
+        self.present[joy] = present
+        if np is not None:
+            self._mask[joy] = present
+
+    @property
+    def connected(self):
+        return [joy for joy, present in enumerate(self.present) if present]
+
+    def update(self):
+        states = self._states
+        present = self.present
+        for joy in range(_NPADS):
+            if present[joy] and not api.glfwGetGamepadState(joy, states[joy]):
+                present[joy] = False
+                if np is not None:
+                    self._mask[joy] = False
+        if np is not None:
+            self._process_arrays()
+        else:
+            self._process_lists()
+
+    def _shape(self, magnitude):
+        curve = self.curve
+        if callable(curve):
+            return curve(magnitude)
+        return magnitude if curve == 1.0 else magnitude ** curve
+
+    def _process_arrays(self):
+        mask = self._mask[:, None]
+        sticks = self._raw_axes[:, :4].reshape(_NPADS, 2, 2)
+        magnitude = np.sqrt((sticks * sticks).sum(axis=2))
+        dz = self.deadzone
+        scaled = np.clip((magnitude - dz) / (1.0 - dz), 0.0, 1.0)
+        scaled = self._shape(scaled)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            factor = np.where(magnitude > dz, scaled / magnitude, 0.0)
+        np.multiply(sticks, factor[:, :, None], out=self.sticks)
+        self.sticks *= mask[:, :, None]
+
+        tdz = self.trigger_deadzone
+        triggers = (self._raw_axes[:, 4:6] + 1.0) * 0.5
+        np.clip((triggers - tdz) / (1.0 - tdz), 0.0, 1.0, out=self.triggers)
+        self.triggers *= mask
+
+        np.not_equal(self._raw_buttons[:, self._remap], 0, out=self.buttons)
+        self.buttons &= mask
+
+    def _process_lists(self):
+        dz = self.deadzone
+        tdz = self.trigger_deadzone
+        remap = self._remap
+        for joy in range(_NPADS):
+            sticks, triggers, buttons = self.sticks[joy], self.triggers[joy], self.buttons[joy]
+            if not self.present[joy]:
+                sticks[0][:] = sticks[1][:] = (0.0, 0.0)
+                triggers[:] = (0.0, 0.0)
+                buttons[:] = [False] * _NBUTTONS
+                continue
+            state = self._states[joy]
+            axes = state.axes
+            for stick in range(2):
+                x, y = axes[stick * 2], axes[stick * 2 + 1]
+                magnitude = math.hypot(x, y)
+                if magnitude <= dz:
+                    sticks[stick][:] = (0.0, 0.0)
+                    continue
+                factor = self._shape(min((magnitude - dz) / (1.0 - dz), 1.0)) / magnitude
+                sticks[stick][:] = (x * factor, y * factor)
+            for trigger in range(2):
+                value = (axes[4 + trigger] + 1.0) * 0.5
+                triggers[trigger] = min(max((value - tdz) / (1.0 - tdz), 0.0), 1.0)
+            raw = state.buttons
+            buttons[:] = [bool(raw[i]) for i in remap]
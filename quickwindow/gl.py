@@ -0,0 +1,243 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from . import glfw as api
+from .window import Window
+from ctypes import (c_int, c_uint, c_ubyte, c_float, c_double, c_char_p,
+                    c_void_p, c_ssize_t, c_uint64, CFUNCTYPE, POINTER)
+from typing import Optional
+import weakref
+
+__all__ = ["GLFunctionTable", "GLLoader", "gl_functions"]
+
+GL_NO_ERROR                     = 0
+GL_COLOR_BUFFER_BIT             = 0x00004000
+GL_DEPTH_BUFFER_BIT             = 0x00000100
+GL_TRIANGLES                    = 0x0004
+GL_TRIANGLE_STRIP               = 0x0005
+GL_UNPACK_ALIGNMENT             = 0x0CF5
+GL_PACK_ALIGNMENT               = 0x0D05
+GL_TEXTURE_2D                   = 0x0DE1
+GL_UNSIGNED_BYTE                = 0x1401
+GL_FLOAT                        = 0x1406
+GL_RGB                          = 0x1907
+GL_RGBA                         = 0x1908
+GL_VENDOR                       = 0x1F00
+GL_RENDERER                     = 0x1F01
+GL_VERSION                      = 0x1F02
+GL_NEAREST                      = 0x2600
+GL_LINEAR                       = 0x2601
+GL_TEXTURE_MAG_FILTER           = 0x2800
+GL_TEXTURE_MIN_FILTER           = 0x2801
+GL_TEXTURE_WRAP_S               = 0x2802
+GL_TEXTURE_WRAP_T               = 0x2803
+GL_CLAMP_TO_EDGE                = 0x812F
+GL_RGBA8                        = 0x8058
+GL_RGB8                         = 0x8051
+GL_TEXTURE0                     = 0x84C0
+GL_ARRAY_BUFFER                 = 0x8892
+GL_STREAM_DRAW                  = 0x88E0
+GL_STREAM_READ                  = 0x88E1
+GL_PIXEL_PACK_BUFFER            = 0x88EB
+GL_PIXEL_UNPACK_BUFFER          = 0x88EC
+GL_FRAGMENT_SHADER              = 0x8B30
+GL_VERTEX_SHADER                = 0x8B31
+GL_COMPILE_STATUS               = 0x8B81
+GL_LINK_STATUS                  = 0x8B82
+GL_READ_FRAMEBUFFER             = 0x8CA8
+GL_DRAW_FRAMEBUFFER             = 0x8CA9
+GL_MAP_READ_BIT                 = 0x0001
+GL_MAP_WRITE_BIT                = 0x0002
+GL_MAP_INVALIDATE_BUFFER_BIT    = 0x0008
+GL_MAP_UNSYNCHRONIZED_BIT       = 0x0020
+GL_SYNC_GPU_COMMANDS_COMPLETE   = 0x9117
+GL_SYNC_FLUSH_COMMANDS_BIT      = 0x0001
+GL_ALREADY_SIGNALED             = 0x911A
+GL_TIMEOUT_EXPIRED              = 0x911B
+GL_CONDITION_SATISFIED          = 0x911C
+GL_WAIT_FAILED                  = 0x911D
+GL_TIMEOUT_IGNORED              = 0xFFFFFFFFFFFFFFFF
+
+c_void = None
+_uint_p = POINTER(c_uint)
+_int_p = POINTER(c_int)
+
+GL_DECLARATIONS = {
+    'glGetError':               (c_uint,),
+    'glGetString':              (c_char_p, c_uint),
+    'glGetIntegerv':            (c_void, c_uint, _int_p),
+    'glEnable':                 (c_void, c_uint),
+    'glDisable':                (c_void, c_uint),
+    'glFlush':                  (c_void,),
+    'glFinish':                 (c_void,),
+    'glViewport':               (c_void, c_int, c_int, c_int, c_int),
+    'glClear':                  (c_void, c_uint),
+    'glClearColor':             (c_void, c_float, c_float, c_float, c_float),
+    'glPixelStorei':            (c_void, c_uint, c_int),
+    'glReadPixels':             (c_void, c_int, c_int, c_int, c_int, c_uint, c_uint, c_void_p),
+    'glDrawArrays':             (c_void, c_uint, c_int, c_int),
+
+    'glGenTextures':            (c_void, c_int, _uint_p),
+    'glDeleteTextures':         (c_void, c_int, _uint_p),
+    'glBindTexture':            (c_void, c_uint, c_uint),
+    'glActiveTexture':          (c_void, c_uint),
+    'glTexParameteri':          (c_void, c_uint, c_uint, c_int),
+    'glTexImage2D':             (c_void, c_uint, c_int, c_int, c_int, c_int, c_int, c_uint, c_uint, c_void_p),
+    'glTexSubImage2D':          (c_void, c_uint, c_int, c_int, c_int, c_int, c_int, c_uint, c_uint, c_void_p),
+
+    'glGenBuffers':             (c_void, c_int, _uint_p),
+    'glDeleteBuffers':          (c_void, c_int, _uint_p),
+    'glBindBuffer':             (c_void, c_uint, c_uint),
+    'glBufferData':             (c_void, c_uint, c_ssize_t, c_void_p, c_uint),
+    'glBufferSubData':          (c_void, c_uint, c_ssize_t, c_ssize_t, c_void_p),
+    'glMapBufferRange':         (c_void_p, c_uint, c_ssize_t, c_ssize_t, c_uint),
+    'glUnmapBuffer':            (c_ubyte, c_uint),
+
+    'glGenVertexArrays':        (c_void, c_int, _uint_p),
+    'glDeleteVertexArrays':     (c_void, c_int, _uint_p),
+    'glBindVertexArray':        (c_void, c_uint),
+
+    'glGenFramebuffers':        (c_void, c_int, _uint_p),
+    'glDeleteFramebuffers':     (c_void, c_int, _uint_p),
+    'glBindFramebuffer':        (c_void, c_uint, c_uint),
+    'glFramebufferTexture2D':   (c_void, c_uint, c_uint, c_uint, c_uint, c_int),
+    'glBlitFramebuffer':        (c_void, c_int, c_int, c_int, c_int, c_int, c_int, c_int, c_int, c_uint, c_uint),
+
+    'glCreateShader':           (c_uint, c_uint),
+    'glDeleteShader':           (c_void, c_uint),
+    'glShaderSource':           (c_void, c_uint, c_int, POINTER(c_char_p), _int_p),
+    'glCompileShader':          (c_void, c_uint),
+    'glGetShaderiv':            (c_void, c_uint, c_uint, _int_p),
+    'glGetShaderInfoLog':       (c_void, c_uint, c_int, _int_p, c_char_p),
+    'glCreateProgram':          (c_uint,),
+    'glDeleteProgram':          (c_void, c_uint),
+    'glAttachShader':           (c_void, c_uint, c_uint),
+    'glLinkProgram':            (c_void, c_uint),
+    'glGetProgramiv':           (c_void, c_uint, c_uint, _int_p),
+    'glGetProgramInfoLog':      (c_void, c_uint, c_int, _int_p, c_char_p),
+    'glUseProgram':             (c_void, c_uint),
+    'glGetUniformLocation':     (c_int, c_uint, c_char_p),
+    'glUniform1i':              (c_void, c_int, c_int),
+
+    'glFenceSync':              (c_void_p, c_uint, c_uint),
+    'glClientWaitSync':         (c_uint, c_void_p, c_uint, c_uint64),
+    'glDeleteSync':             (c_void, c_void_p),
+    'glGetDoublev':             (c_void, c_uint, POINTER(c_double)),
+}
+
+_prototypes = {}
+
+def _prototype(signature):
+    proto = _prototypes.get(signature)
+    if proto is None:
+        proto = _prototypes[signature] = CFUNCTYPE(signature[0], *signature[1:])
+    return proto
+
+class GLFunctionTable:
+    def __init__(self, declarations: dict, window: Optional[Window] = None):
+        self._declarations = declarations
+        self._share_group = window.share_group if window is not None else None
+        self._window = weakref.ref(window) if window is not None else None
+
+    # Pointers are only valid for the share group they were resolved in, so
+    # a lookup under a foreign context switches to the owning window first
+    def _proc_address(self, name):
+        if self._share_group is None:
+            return api.glfwGetProcAddress(name.encode())
+        current = Window.find_current()
+        if current is not None and current.share_group == self._share_group:
+            return api.glfwGetProcAddress(name.encode())
+        window = self._window()
+        if window is None or window.closed:
+            window = next((window for window in list(Window._instance_.values())
+                           if window.share_group == self._share_group), None)
+        if window is None:
+            raise api.NoCurrentContextError(f"No context of this table's share group is current "
+                                            f"to resolve \"{name}\"")
+        with window:
+            return api.glfwGetProcAddress(name.encode())
+
+    # Only reached on a miss: resolved functions are stored on the instance
+    # so every later lookup is a plain attribute access
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        signature = self._declarations.get(name)
+        if signature is None:
+            raise AttributeError(f"OpenGL function \"{name}\" is not declared")
+        addr = self._proc_address(name)
+        if not addr:
+            raise RuntimeError(f"OpenGL function \"{name}\" is unavailable")
+        func = _prototype(signature)(addr)
+        setattr(self, name, func)
+        return func
+
+    def __contains__(self, name):
+        return name in self.__dict__
+
+    def load(self, *names):
+        for name in names or self._declarations:
+            getattr(self, name)
+        return self
+
+    def available(self, name):
+        try:
+            getattr(self, name)
+        except (AttributeError, RuntimeError):
+            return False
+        return True
+
+class GLLoader:
+    def __init__(self, declarations: Optional[dict] = None, lazy: bool = True):
+        self.declarations = dict(GL_DECLARATIONS)
+        if declarations:
+            self.declarations.update(declarations)
+        self.lazy = lazy
+        self._tables = {}
+
+    def declare(self, name, restype=c_void, *argtypes):
+        self.declarations[name] = (restype, *argtypes)
+
+    def functions(self, window: Optional[Window] = None) -> GLFunctionTable:
+        if window is None:
+            window = Window.find_current()
+            if window is None:
+                raise api.NoCurrentContextError("No current OpenGL context")
+        table = self._tables.get(window.share_group)
+        if table is None:
+            table = self._tables[window.share_group] = GLFunctionTable(self.declarations, window)
+            if not self.lazy:
+                with window:
+                    table.load()
+        return table
+
+    def release(self, window: Window):
+        self.release_group(window.share_group)
+
+    def release_group(self, share_group):
+        self._tables.pop(share_group, None)
+
+_loader = GLLoader()
+
+def gl_functions(window: Optional[Window] = None) -> GLFunctionTable:
+    return _loader.functions(window)
@@ -29,6 +29,7 @@ import threading
 from sys import modules as _sys_modules
 import atexit
 from typing import Optional
+from time import perf_counter_ns as _perf_counter_ns
 
 c_void = None
 c_func = CFUNCTYPE
@@ -170,6 +171,14 @@ class GLFWgammaramp(Structure):
 
 GLFWgammarampP = _RAMPPTR(GLFWgammaramp)
 
+class GLFWgamepadstate(Structure):
+    _fields_ = [
+        ("buttons", c_ubyte * 15),
+        ("axes",    c_float * 6),
+    ]
+
+GLFWgamepadstateP = POINTER(GLFWgamepadstate)
+
 # ---- callback prototypes ----
 
 GLFWerrorfun            = _FUNCPTR(c_func(c_void,    c_int, c_char_p))
@@ -187,6 +196,7 @@ GLFWscrollfun           = _FUNCPTR(c_func(c_void,    GLFWwindowP, c_double, c_do
 GLFWkeyfun              = _FUNCPTR(c_func(c_void,    GLFWwindowP, c_int, c_int, c_int, c_int))
 GLFWcharfun             = _FUNCPTR(c_func(c_void,    GLFWwindowP, c_uint))
 GLFWmonitorfun          = _FUNCPTR(c_func(c_void,    GLFWmonitorP, c_int))
+GLFWjoystickfun         = _FUNCPTR(c_func(c_void,    c_int, c_int))
 
 # ---- constant definitions ----
 
@@ -292,6 +302,45 @@ GLFW_JOYSTICK_15            = 14
 GLFW_JOYSTICK_16            = 15
 GLFW_JOYSTICK_LAST          = GLFW_JOYSTICK_16
 
+GLFW_HAT_CENTERED           = 0
+GLFW_HAT_UP                 = 1
+GLFW_HAT_RIGHT              = 2
+GLFW_HAT_DOWN               = 4
+GLFW_HAT_LEFT               = 8
+GLFW_HAT_RIGHT_UP           = GLFW_HAT_RIGHT | GLFW_HAT_UP
+GLFW_HAT_RIGHT_DOWN         = GLFW_HAT_RIGHT | GLFW_HAT_DOWN
+GLFW_HAT_LEFT_UP            = GLFW_HAT_LEFT | GLFW_HAT_UP
+GLFW_HAT_LEFT_DOWN          = GLFW_HAT_LEFT | GLFW_HAT_DOWN
+
+GLFW_GAMEPAD_BUTTON_A               = 0
+GLFW_GAMEPAD_BUTTON_B               = 1
+GLFW_GAMEPAD_BUTTON_X               = 2
+GLFW_GAMEPAD_BUTTON_Y               = 3
+GLFW_GAMEPAD_BUTTON_LEFT_BUMPER     = 4
+GLFW_GAMEPAD_BUTTON_RIGHT_BUMPER    = 5
+GLFW_GAMEPAD_BUTTON_BACK            = 6
+GLFW_GAMEPAD_BUTTON_START           = 7
+GLFW_GAMEPAD_BUTTON_GUIDE           = 8
+GLFW_GAMEPAD_BUTTON_LEFT_THUMB      = 9
+GLFW_GAMEPAD_BUTTON_RIGHT_THUMB     = 10
+GLFW_GAMEPAD_BUTTON_DPAD_UP         = 11
+GLFW_GAMEPAD_BUTTON_DPAD_RIGHT      = 12
+GLFW_GAMEPAD_BUTTON_DPAD_DOWN       = 13
+GLFW_GAMEPAD_BUTTON_DPAD_LEFT       = 14
+GLFW_GAMEPAD_BUTTON_LAST            = GLFW_GAMEPAD_BUTTON_DPAD_LEFT
+GLFW_GAMEPAD_BUTTON_CROSS           = GLFW_GAMEPAD_BUTTON_A
+GLFW_GAMEPAD_BUTTON_CIRCLE          = GLFW_GAMEPAD_BUTTON_B
+GLFW_GAMEPAD_BUTTON_SQUARE          = GLFW_GAMEPAD_BUTTON_X
+GLFW_GAMEPAD_BUTTON_TRIANGLE        = GLFW_GAMEPAD_BUTTON_Y
+
+GLFW_GAMEPAD_AXIS_LEFT_X            = 0
+GLFW_GAMEPAD_AXIS_LEFT_Y            = 1
+GLFW_GAMEPAD_AXIS_RIGHT_X           = 2
+GLFW_GAMEPAD_AXIS_RIGHT_Y           = 3
+GLFW_GAMEPAD_AXIS_LEFT_TRIGGER      = 4
+GLFW_GAMEPAD_AXIS_RIGHT_TRIGGER     = 5
+GLFW_GAMEPAD_AXIS_LAST              = GLFW_GAMEPAD_AXIS_RIGHT_TRIGGER
+
 GLFW_KEY_UNKNOWN            = -1
 
 GLFW_KEY_SPACE              = 32
@@ -513,6 +562,7 @@ _declare('glfwSetFramebufferSizeCallback', GLFWframebuffersizefun, GLFWwindowP,
 
 _declare('glfwPollEvents', c_void)
 _declare('glfwWaitEvents', c_void)
+_declare('glfwPostEmptyEvent', c_void)
 
 _declare('glfwGetInputMode', c_int, GLFWwindowP, c_int)
 _declare('glfwSetInputMode', c_void, GLFWwindowP, c_int, c_int)
@@ -526,6 +576,12 @@ _declare('glfwJoystickPresent', c_int, c_int)
 _declare('glfwGetJoystickAxes', (POINTER(c_float), ret_list_p(1)), c_int, (POINTER(c_int),))
 _declare('glfwGetJoystickButtons', (POINTER(c_ubyte), ret_list_p(1)), c_int, (POINTER(c_int),))
 _declare('glfwGetJoystickName', c_char_p, c_int)
+_declare('glfwGetJoystickHats', (POINTER(c_ubyte), ret_list_p(1)), c_int, (POINTER(c_int),))
+_declare('glfwSetJoystickCallback', GLFWjoystickfun, GLFWjoystickfun)
+_declare('glfwJoystickIsGamepad', c_int, c_int)
+_declare('glfwGetGamepadName', c_char_p, c_int)
+_declare('glfwGetGamepadState', c_int, c_int, GLFWgamepadstateP)
+_declare('glfwUpdateGamepadMappings', c_int, c_char_p)
 
 _declare('glfwSetKeyCallback', GLFWkeyfun, GLFWwindowP, GLFWkeyfun)
 _declare('glfwSetCharCallback', GLFWcharfun, GLFWwindowP, GLFWcharfun)
@@ -553,9 +609,133 @@ def _error_check(func):
 
 from sys import modules as _sys_modules
 
+_checked_functions = {}
+
 for _func_ in _all_functions:
-    setattr(_sys_modules[__name__], _func_,
-            _error_check(_all_functions[_func_]))
+    _checked_functions[_func_] = _error_check(_all_functions[_func_])
+    setattr(_sys_modules[__name__], _func_, _checked_functions[_func_])
+
+# ---- opt-in call instrumentation ----
+
+class FunctionStats:
+    __slots__ = ('name', 'calls', 'frame_calls', 'last_frame_calls', 'max_frame_calls',
+                 'samples', 'sample_ns', 'max_ns')
+
+    def __init__(self, name):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.frame_calls = 0
+        self.last_frame_calls = 0
+        self.max_frame_calls = 0
+        self.samples = 0
+        self.sample_ns = 0
+        self.max_ns = 0
+
+    @property
+    def mean_ns(self):
+        return self.sample_ns / self.samples if self.samples else 0.0
+
+    def as_dict(self, frames):
+        return {
+            'calls': self.calls,
+            'calls_per_frame': self.calls / frames if frames else float(self.calls),
+            'last_frame_calls': self.last_frame_calls,
+            'max_frame_calls': self.max_frame_calls,
+            'samples': self.samples,
+            'mean_ns': self.mean_ns,
+            'max_ns': self.max_ns,
+            'estimated_ns': self.mean_ns * self.calls,
+        }
+
+_instrumentation = None
+
+class _Instrumentation:
+    def __init__(self, sample_every):
+        self.sample_every = max(1, sample_every)
+        self.frames = 0
+        self.stats = {name: FunctionStats(name) for name in _checked_functions}
+
+    def wrap(self, name, func):
+        stats = self.stats[name]
+        sample_every = self.sample_every
+
+        def instrumented(*args, **kwargs):
+            stats.calls += 1
+            stats.frame_calls += 1
+            if stats.calls % sample_every:
+                return func(*args, **kwargs)
+            start = _perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = _perf_counter_ns() - start
+                stats.samples += 1
+                stats.sample_ns += elapsed
+                if elapsed > stats.max_ns:
+                    stats.max_ns = elapsed
+        return instrumented
+
+    def end_frame(self):
+        self.frames += 1
+        for stats in self.stats.values():
+            if stats.frame_calls or stats.last_frame_calls:
+                stats.last_frame_calls = stats.frame_calls
+                if stats.frame_calls > stats.max_frame_calls:
+                    stats.max_frame_calls = stats.frame_calls
+                stats.frame_calls = 0
+
+def enable_instrumentation(sample_every=16):
+    global _instrumentation
+    if _instrumentation is not None:
+        return
+    _instrumentation = _Instrumentation(sample_every)
+    module = _sys_modules[__name__]
+    for name, func in _checked_functions.items():
+        setattr(module, name, _instrumentation.wrap(name, func))
+
+    swap = getattr(module, 'glfwSwapBuffers')
+    def glfwSwapBuffers(*args, **kwargs):
+        try:
+            return swap(*args, **kwargs)
+        finally:
+            end_instrumentation_frame()
+    setattr(module, 'glfwSwapBuffers', glfwSwapBuffers)
+
+def disable_instrumentation():
+    global _instrumentation
+    _instrumentation = None
+    module = _sys_modules[__name__]
+    for name, func in _checked_functions.items():
+        setattr(module, name, func)
+
+def instrumentation_enabled():
+    return _instrumentation is not None
+
+# Called automatically after every glfwSwapBuffers, exposed for loops that
+# do not present through GLFW
+def end_instrumentation_frame():
+    if _instrumentation is not None:
+        _instrumentation.end_frame()
+
+def reset_call_stats():
+    if _instrumentation is not None:
+        _instrumentation.frames = 0
+        for stats in _instrumentation.stats.values():
+            stats.reset()
+
+def call_stats():
+    if _instrumentation is None:
+        return {}
+    frames = _instrumentation.frames
+    return {name: stats.as_dict(frames)
+            for name, stats in _instrumentation.stats.items() if stats.calls}
+
+def hot_spots(count=10, key='calls_per_frame'):
+    stats = call_stats()
+    return sorted(stats.items(), key=lambda item: item[1][key], reverse=True)[:count]
 
 class NotInitializedError(Exception):
     pass
@@ -0,0 +1,241 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from . import glfw as api
+from .window import ManagedWindow
+from .event import *
+from .record import _event_ids, _event_layouts
+from .shm import attach
+from multiprocessing import shared_memory
+from collections import namedtuple
+from struct import Struct
+from time import perf_counter
+from typing import Optional
+
+__all__ = ["InputServer", "InputClient", "InputSnapshot"]
+
+_MAGIC = b"QWIS"
+_VERSION = 1
+
+# magic, version, capacity, record size, records written
+_header = Struct("<4sIIIQ")
+_WRITE_SEQ = 16
+
+# seqlock, frame, time, cursor x/y, mouse buttons, mods, window and framebuffer size, focused
+_state = Struct("<QQdddIIiiiiI4x")
+_STATE = 64
+_KEYS = _STATE + _state.size
+_KEY_BYTES = (api.GLFW_KEY_LAST + 8) // 8
+
+# record sequence, timestamp, type id, frame, then up to 16 bytes of payload
+_record = Struct("<QdB3xI")
+_RECORD_SIZE = _record.size + 16
+# Each slot's sequence doubles as its own seqlock; this marks a slot mid-write
+_WRITING = 0xFFFFFFFFFFFFFFFF
+_RING = 256
+
+InputSnapshot = namedtuple("InputSnapshot", ["frame", "time", "cursor", "mouse_buttons", "mods",
+                                             "size", "framebuffer_size", "focused", "keys"])
+
+class InputServer:
+    def __init__(self, window: ManagedWindow, name: Optional[str] = None, capacity: int = 4096):
+        self.window = window
+        self.capacity = capacity
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=_RING + capacity * _RECORD_SIZE)
+        self._buf = self._shm.buf
+        self._buf[:_RING] = bytes(_RING)
+        _header.pack_into(self._buf, 0, _MAGIC, _VERSION, capacity, _RECORD_SIZE, 0)
+        self._seq = 0
+        self._state_seq = 0
+        self._start = perf_counter()
+        self._cursor = (0.0, 0.0)
+        self._buttons = 0
+        self._mods = 0
+        self._size = tuple(window.size)
+        self._framebuffer_size = tuple(window.framebuffer_size)
+        self._focused = 1
+        self._keys = bytearray(_KEY_BYTES)
+        self._publish_state()
+        window.add_listener(self._on_event)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _on_event(self, window, event):
+        ids = _event_ids.get(type(event))
+        if ids is None:
+            return
+        tid, layout, values = ids
+        buf = self._buf
+        seq = self._seq
+        offset = _RING + (seq % self.capacity) * _RECORD_SIZE
+        now = perf_counter() - self._start
+        _record.pack_into(buf, offset, _WRITING, now, tid, window.frame)
+        layout.pack_into(buf, offset + _record.size, *values(event))
+        buf[offset:offset + 8] = seq.to_bytes(8, 'little')
+        self._seq = seq + 1
+        # Publishing the count last makes the record visible to readers
+        buf[_WRITE_SEQ:_WRITE_SEQ + 8] = self._seq.to_bytes(8, 'little')
+        if self._track(event):
+            self._publish_state()
+
+    def _track(self, event):
+        cls = type(event)
+        if cls is CursorPosEvent:
+            self._cursor = (event.x, event.y)
+        elif cls is KeyEvent:
+            self._mods = event.mods
+            if 0 <= event.key <= api.GLFW_KEY_LAST:
+                byte, bit = divmod(event.key, 8)
+                if event.action == api.GLFW_RELEASE:
+                    self._keys[byte] &= ~(1 << bit) & 0xFF
+                else:
+                    self._keys[byte] |= 1 << bit
+        elif cls is MouseButtonEvent:
+            self._mods = event.mods
+            if event.action == api.GLFW_RELEASE:
+                self._buttons &= ~(1 << event.button)
+            else:
+                self._buttons |= 1 << event.button
+        elif cls is WindowSizeEvent:
+            self._size = (event.width, event.height)
+        elif cls is FrameBufferSizeEvent:
+            self._framebuffer_size = (event.width, event.height)
+        elif cls is WindowFocusEvent:
+            self._focused = int(event.status)
+        else:
+            return False
+        return True
+
+    def _publish_state(self):
+        buf = self._buf
+        self._state_seq += 1
+        buf[_STATE:_STATE + 8] = self._state_seq.to_bytes(8, 'little')
+        _state.pack_into(buf, _STATE, self._state_seq, self.window.frame, perf_counter() - self._start,
+                         *self._cursor, self._buttons, self._mods,
+                         *self._size, *self._framebuffer_size, self._focused)
+        buf[_KEYS:_KEYS + _KEY_BYTES] = self._keys
+        self._state_seq += 1
+        buf[_STATE:_STATE + 8] = self._state_seq.to_bytes(8, 'little')
+
+    # Bumps the snapshot's frame number; call once per frame when workers
+    # need frame-accurate snapshots even on frames without input
+    def publish(self):
+        self._publish_state()
+
+    def close(self):
+        if self._shm is None:
+            return
+        self.window.remove_listener(self._on_event)
+        self._buf.release()
+        self._buf = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+class InputClient:
+    def __init__(self, name: str, from_start: bool = False):
+        self._shm = attach(name)
+        self._buf = self._shm.buf
+        magic, version, capacity, record_size, written = _header.unpack_from(self._buf, 0)
+        if magic != _MAGIC or version != _VERSION or record_size != _RECORD_SIZE:
+            self.close()
+            raise ValueError(f"\"{name}\" is not a quickwindow input server")
+        self.capacity = capacity
+        self.cursor = 0 if from_start else written
+        self.dropped = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _written(self):
+        return int.from_bytes(self._buf[_WRITE_SEQ:_WRITE_SEQ + 8], 'little')
+
+    # Yields (type id, frame, time, payload) tuples without building events
+    def records(self):
+        buf = self._buf
+        capacity = self.capacity
+        written = self._written()
+        if written - self.cursor > capacity:
+            self.dropped += written - self.cursor - capacity
+            self.cursor = written - capacity
+        while self.cursor < written:
+            seq = self.cursor
+            offset = _RING + (seq % capacity) * _RECORD_SIZE
+            rseq, stamp, tid, frame = _record.unpack_from(buf, offset)
+            layout = _event_layouts.get(tid)
+            payload = layout[1].unpack_from(buf, offset + _record.size) if layout is not None else None
+            # The slot is only intact if its sequence was ours both before
+            # and after the payload was copied out
+            after = int.from_bytes(buf[offset:offset + 8], 'little')
+            if rseq != seq or after != seq or self._written() - seq > capacity:
+                written = self._written()
+                self.dropped += 1
+                self.cursor = max(seq + 1, written - capacity)
+                continue
+            self.cursor = seq + 1
+            yield tid, frame, stamp, payload
+
+    def events(self):
+        for tid, frame, stamp, payload in self.records():
+            cls = _event_layouts[tid][0]
+            if cls is CharEvent:
+                payload = (chr(payload[0]),)
+            yield cls(*payload)
+
+    def snapshot(self):
+        buf = self._buf
+        while True:
+            before = int.from_bytes(buf[_STATE:_STATE + 8], 'little')
+            if before & 1:
+                continue
+            (seq, frame, stamp, cx, cy, buttons, mods,
+             width, height, fb_width, fb_height, focused) = _state.unpack_from(buf, _STATE)
+            keys = bytes(buf[_KEYS:_KEYS + _KEY_BYTES])
+            if seq == before and int.from_bytes(buf[_STATE:_STATE + 8], 'little') == before:
+                return InputSnapshot(frame, stamp, (cx, cy), buttons, mods,
+                                     (width, height), (fb_width, fb_height), bool(focused), keys)
+
+    def key(self, key: int) -> bool:
+        byte, bit = divmod(key, 8)
+        return bool(self._buf[_KEYS + byte] & (1 << bit))
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._buf.release()
+        self._buf = None
+        self._shm.close()
+        self._shm = None
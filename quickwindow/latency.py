@@ -0,0 +1,90 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from .event import INPUT_EVENTS
+from array import array
+
+__all__ = ["LatencyTracker"]
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+class LatencyTracker:
+    def __init__(self, capacity: int = 4096, kinds=INPUT_EVENTS):
+        self.capacity = capacity
+        self.kinds = kinds
+        self.frames = 0
+        self.events = 0
+        self.last_frame = ()
+        self._samples = array('d', [0.0]) * capacity
+        self._index = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    # Called by ManagedWindow.swap_buffers() with the frame's events and the
+    # time swap returned, the closest point to "on screen" we can observe
+    def frame(self, events, presented: float):
+        kinds = self.kinds
+        samples = self._samples
+        capacity = self.capacity
+        latencies = []
+        for event in events:
+            if type(event) in kinds and event.timestamp:
+                latency = presented - event.timestamp
+                latencies.append(latency)
+                samples[self._index] = latency
+                self._index = (self._index + 1) % capacity
+        if latencies:
+            self._count = min(self._count + len(latencies), capacity)
+            self.events += len(latencies)
+        self.last_frame = latencies
+        self.frames += 1
+
+    def samples(self):
+        if self._count < self.capacity:
+            return list(self._samples[:self._count])
+        return list(self._samples[self._index:]) + list(self._samples[:self._index])
+
+    def stats(self):
+        ordered = sorted(self.samples())
+        return {
+            'frames': self.frames,
+            'events': self.events,
+            'samples': len(ordered),
+            'min': ordered[0] if ordered else 0.0,
+            'median': _percentile(ordered, 0.5),
+            'p99': _percentile(ordered, 0.99),
+            'max': ordered[-1] if ordered else 0.0,
+        }
+
+    def reset(self):
+        self.frames = 0
+        self.events = 0
+        self.last_frame = ()
+        self._index = 0
+        self._count = 0
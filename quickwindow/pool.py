@@ -0,0 +1,194 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from .window import init_glfw, Window, Hints
+from time import perf_counter
+from typing import Optional, Dict, Type
+
+__all__ = ["WindowPool"]
+
+class _Idle:
+    __slots__ = 'window', 'key', 'created', 'released'
+
+    def __init__(self, window, key, created):
+        self.window = window
+        self.key = key
+        self.created = created
+        self.released = perf_counter()
+
+class WindowPool:
+    LRU = "lru"
+    OLDEST = "oldest"
+
+    def __init__(self,
+                 window_class: Type[Window] = Window,
+                 max_idle: int = 8,
+                 max_idle_per_profile: Optional[int] = None,
+                 max_idle_time: Optional[float] = None,
+                 policy: str = LRU,
+                 shared: Optional[Window] = None,
+                 **window_kwargs):
+        if policy not in (self.LRU, self.OLDEST):
+            raise ValueError(f"Invalid eviction policy \"{policy}\"")
+        self.window_class = window_class
+        self.max_idle = max_idle
+        self.max_idle_per_profile = max_idle_per_profile
+        self.max_idle_time = max_idle_time
+        self.policy = policy
+        self.shared = shared
+        self.window_kwargs = window_kwargs
+        self._idle = {}
+        self._owned = {}
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __len__(self):
+        return sum(len(idle) for idle in self._idle.values())
+
+    @staticmethod
+    def _key(hints):
+        if hints is None:
+            return ()
+        if not isinstance(hints, Hints):
+            hints = Hints(**hints)
+        return tuple(sorted(hints._hints.items()))
+
+    def _create(self, key, width, height, title):
+        init_glfw()
+        # A window's hints are its profile alone; the caller's global hints
+        # are put back once it exists
+        saved = Window.current_hints()
+        Window.hint()
+        hints = Hints()
+        for hint, value in key:
+            hints[hint] = value
+        hints.visible = False
+        Window.hint(hints=hints)
+        try:
+            window = self.window_class(width, height, title, shared=self.shared, **self.window_kwargs)
+        finally:
+            Window.hint()
+            if saved._hints:
+                Window.hint(hints=saved)
+        self.created += 1
+        return window
+
+    def prewarm(self, count: int, hints: Optional[Dict] = None, width: int = 64, height: int = 64):
+        key = self._key(hints)
+        for _ in range(count):
+            window = self._create(key, width, height, "")
+            self._push(_Idle(window, key, perf_counter()))
+        self.trim()
+
+    def acquire(self, width: int, height: int, title: str,
+                hints: Optional[Dict] = None,
+                callbacks: Optional[Dict] = None,
+                visible: bool = True) -> Window:
+        self.trim()
+        key = self._key(hints)
+        idle = self._idle.get(key)
+        while idle and idle[-1].window.closed:
+            idle.pop()
+        if idle:
+            entry = idle.pop()
+            window = entry.window
+            created = entry.created
+            window.size = (width, height)
+            window.set_title(title)
+            self.reused += 1
+        else:
+            window = self._create(key, width, height, title)
+            created = perf_counter()
+        if callbacks:
+            cls = type(window)
+            for name, callback in callbacks.items():
+                setter = getattr(cls, f"set_{name}_callback", None)
+                if setter is None:
+                    raise ValueError(f"Invalid callback \"{name}\"")
+                setter(window, callback)
+        self._owned[window] = (key, created)
+        if visible:
+            window.show()
+        return window
+
+    def release(self, window: Window):
+        owned = self._owned.pop(window, None)
+        if owned is None:
+            raise ValueError("Window was not acquired from this pool")
+        if window.closed:
+            return
+        key, created = owned
+        window.hide()
+        window.reset()
+        self._push(_Idle(window, key, created))
+        self.trim()
+
+    def _push(self, entry):
+        idle = self._idle.setdefault(entry.key, [])
+        idle.append(entry)
+        limit = self.max_idle_per_profile
+        if limit is not None and len(idle) > limit:
+            self._evict(self._victim(idle))
+
+    def _victim(self, entries):
+        if self.policy == self.OLDEST:
+            return min(entries, key=lambda entry: entry.created)
+        return min(entries, key=lambda entry: entry.released)
+
+    def _evict(self, entry):
+        idle = self._idle[entry.key]
+        idle.remove(entry)
+        if not idle:
+            del self._idle[entry.key]
+        entry.window.close()
+        self.evicted += 1
+
+    # Closes idle windows past max_idle_time, then evicts by policy until
+    # the pool is within max_idle
+    def trim(self):
+        if self.max_idle_time is not None:
+            cutoff = perf_counter() - self.max_idle_time
+            for entry in [entry for idle in self._idle.values() for entry in idle if entry.released < cutoff]:
+                self._evict(entry)
+        excess = len(self) - self.max_idle
+        if excess > 0:
+            entries = [entry for idle in self._idle.values() for entry in idle]
+            for _ in range(excess):
+                entry = self._victim(entries)
+                entries.remove(entry)
+                self._evict(entry)
+
+    def close(self):
+        for entry in [entry for idle in self._idle.values() for entry in idle]:
+            self._evict(entry)
+        for window in list(self._owned):
+            window.close()
+        self._owned.clear()
@@ -0,0 +1,202 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from . import glfw as api
+from .window import Window, ManagedWindow
+from .event import FrameBufferSizeEvent
+from .gl import gl_functions
+from .gl import (GL_TEXTURE_2D, GL_TEXTURE0, GL_RGB, GL_RGBA, GL_RGB8, GL_RGBA8, GL_UNSIGNED_BYTE,
+                 GL_UNPACK_ALIGNMENT, GL_TEXTURE_MIN_FILTER, GL_TEXTURE_MAG_FILTER, GL_TEXTURE_WRAP_S,
+                 GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE, GL_NEAREST, GL_LINEAR, GL_PIXEL_UNPACK_BUFFER,
+                 GL_STREAM_DRAW, GL_MAP_WRITE_BIT, GL_MAP_INVALIDATE_BUFFER_BIT, GL_TRIANGLES,
+                 GL_VERTEX_SHADER, GL_FRAGMENT_SHADER, GL_COMPILE_STATUS, GL_LINK_STATUS,
+                 GL_COLOR_BUFFER_BIT, GL_DRAW_FRAMEBUFFER)
+from ctypes import c_int, c_uint, c_ubyte, c_char_p, byref, create_string_buffer
+from typing import Optional
+
+__all__ = ["FramePresenter"]
+
+_VERTEX_SHADER = """
+out vec2 uv;
+void main() {
+    vec2 p = vec2((gl_VertexID << 1) & 2, gl_VertexID & 2);
+    uv = vec2(p.x, 1.0 - p.y);
+    gl_Position = vec4(p * 2.0 - 1.0, 0.0, 1.0);
+}
+"""
+
+_FRAGMENT_SHADER = """
+uniform sampler2D image;
+in vec2 uv;
+out vec4 color;
+void main() {
+    color = texture(image, uv);
+}
+"""
+
+_formats = {
+    3: (GL_RGB8, GL_RGB),
+    4: (GL_RGBA8, GL_RGBA),
+}
+
+def _compile(gl, kind, version, source):
+    shader = gl.glCreateShader(kind)
+    src = c_char_p(("#version %d\n%s" % (version, source)).encode())
+    gl.glShaderSource(shader, 1, byref(src), None)
+    gl.glCompileShader(shader)
+    status = c_int()
+    gl.glGetShaderiv(shader, GL_COMPILE_STATUS, byref(status))
+    if not status.value:
+        log = create_string_buffer(4096)
+        gl.glGetShaderInfoLog(shader, len(log), None, log)
+        gl.glDeleteShader(shader)
+        raise RuntimeError("Shader compilation failed: %s" % log.value.decode(errors='replace'))
+    return shader
+
+def _buffer_shape(buffer, width, height):
+    view = memoryview(buffer)
+    if not view.c_contiguous:
+        raise ValueError("Buffer must be C-contiguous")
+    if width is None or height is None:
+        if view.ndim < 2:
+            raise ValueError("Width and height are required for flat buffers")
+        height, width = view.shape[:2]
+    view = view.cast('B')
+    channels, remainder = divmod(view.nbytes, width * height)
+    if remainder or channels not in _formats:
+        raise ValueError("Buffer must hold %dx%d RGB or RGBA bytes" % (width, height))
+    return view, width, height, channels
+
+class FramePresenter:
+    def __init__(self, window: Window, filter: str = 'nearest', fit: bool = False):
+        self.window = window
+        self.fit = fit
+        self.width = self.height = self.channels = 0
+        self._filter = GL_LINEAR if filter == 'linear' else GL_NEAREST
+        self._capacity = 0
+        if isinstance(window, ManagedWindow):
+            self._framebuffer_size = tuple(window.framebuffer_size)
+            window.add_listener(self._on_event)
+        else:
+            self._framebuffer_size = None
+        with window:
+            self._gl = gl = gl_functions(window)
+            major = window._get_attrib(api.GLFW_CONTEXT_VERSION_MAJOR)
+            minor = window._get_attrib(api.GLFW_CONTEXT_VERSION_MINOR)
+            version = 150 if (major, minor) >= (3, 2) else 130
+            vs = _compile(gl, GL_VERTEX_SHADER, version, _VERTEX_SHADER)
+            fs = _compile(gl, GL_FRAGMENT_SHADER, version, _FRAGMENT_SHADER)
+            self._program = gl.glCreateProgram()
+            gl.glAttachShader(self._program, vs)
+            gl.glAttachShader(self._program, fs)
+            gl.glLinkProgram(self._program)
+            gl.glDeleteShader(vs)
+            gl.glDeleteShader(fs)
+            status = c_int()
+            gl.glGetProgramiv(self._program, GL_LINK_STATUS, byref(status))
+            if not status.value:
+                log = create_string_buffer(4096)
+                gl.glGetProgramInfoLog(self._program, len(log), None, log)
+                raise RuntimeError("Program link failed: %s" % log.value.decode(errors='replace'))
+            gl.glUseProgram(self._program)
+            gl.glUniform1i(gl.glGetUniformLocation(self._program, b"image"), 0)
+            gl.glUseProgram(0)
+            self._vao = c_uint()
+            gl.glGenVertexArrays(1, byref(self._vao))
+            self._texture = c_uint()
+            gl.glGenTextures(1, byref(self._texture))
+            self._pbo = c_uint()
+            gl.glGenBuffers(1, byref(self._pbo))
+
+    def _on_event(self, window, event):
+        if type(event) is FrameBufferSizeEvent:
+            self._framebuffer_size = (event.width, event.height)
+
+    def _allocate(self, width, height, channels):
+        gl = self._gl
+        internal, fmt = _formats[channels]
+        gl.glBindTexture(GL_TEXTURE_2D, self._texture)
+        gl.glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, self._filter)
+        gl.glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, self._filter)
+        gl.glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        gl.glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        gl.glTexImage2D(GL_TEXTURE_2D, 0, internal, width, height, 0, fmt, GL_UNSIGNED_BYTE, None)
+        self.width, self.height, self.channels = width, height, channels
+        self._capacity = width * height * channels
+
+    def _viewport(self):
+        if self._framebuffer_size is None:
+            fb_width, fb_height = self.window.framebuffer_size
+        else:
+            fb_width, fb_height = self._framebuffer_size
+        if not self.fit or not self.width or not self.height:
+            return 0, 0, fb_width, fb_height
+        scale = min(fb_width / self.width, fb_height / self.height)
+        width, height = int(self.width * scale), int(self.height * scale)
+        return (fb_width - width) // 2, (fb_height - height) // 2, width, height
+
+    # Uploads and draws `buffer`; the window's context must be current
+    def present(self, buffer, width: Optional[int] = None, height: Optional[int] = None):
+        gl = self._gl
+        view, width, height, channels = _buffer_shape(buffer, width, height)
+        if (width, height, channels) != (self.width, self.height, self.channels):
+            self._allocate(width, height, channels)
+        else:
+            gl.glBindTexture(GL_TEXTURE_2D, self._texture)
+        nbytes = self._capacity
+        gl.glBindBuffer(GL_PIXEL_UNPACK_BUFFER, self._pbo)
+        # Orphan the previous storage so the driver never waits on the last upload
+        gl.glBufferData(GL_PIXEL_UNPACK_BUFFER, nbytes, None, GL_STREAM_DRAW)
+        ptr = gl.glMapBufferRange(GL_PIXEL_UNPACK_BUFFER, 0, nbytes,
+                                  GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT)
+        if ptr:
+            memoryview((c_ubyte * nbytes).from_address(ptr)).cast('B')[:] = view
+            gl.glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER)
+            gl.glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+            gl.glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, width, height,
+                               _formats[channels][1], GL_UNSIGNED_BYTE, None)
+        gl.glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+
+        gl.glBindFramebuffer(GL_DRAW_FRAMEBUFFER, 0)
+        if self.fit:
+            gl.glClear(GL_COLOR_BUFFER_BIT)
+        gl.glViewport(*self._viewport())
+        gl.glUseProgram(self._program)
+        gl.glActiveTexture(GL_TEXTURE0)
+        gl.glBindVertexArray(self._vao)
+        gl.glDrawArrays(GL_TRIANGLES, 0, 3)
+        gl.glBindVertexArray(0)
+        gl.glUseProgram(0)
+
+    def close(self):
+        if self._program is None:
+            return
+        if isinstance(self.window, ManagedWindow):
+            self.window.remove_listener(self._on_event)
+        gl = self._gl
+        with self.window:
+            gl.glDeleteBuffers(1, byref(self._pbo))
+            gl.glDeleteTextures(1, byref(self._texture))
+            gl.glDeleteVertexArrays(1, byref(self._vao))
+            gl.glDeleteProgram(self._program)
+        self._program = None
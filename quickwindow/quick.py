@@ -22,22 +22,231 @@
 # SOFTWARE.
 
 from .window import init_glfw, ManagedWindow, FrameLimiter, Window, Monitor, Keys
+from .trace import FrameTracer
+from .vsync import AdaptiveVSync
+from .stages import FrameScheduler
+from .watchdog import FrameWatchdog
+from .alloc import AllocationTracker
 from . import glfw as api
-from typing import Optional, Union, Tuple, Dict
-from contextlib import contextmanager
+from typing import Optional, Union, Tuple, Dict, override
+from contextlib import contextmanager, nullcontext
+from time import perf_counter_ns
 
-__all__ = ["quick_window", "handle", "should_close", "width", "height", "size", "loop", "events"]
+_no_span = nullcontext()
+
+__all__ = ["quick_window", "handle", "should_close", "width", "height", "size", "loop", "events", "text", "span", "run"]
+
+class _WatchdogHook:
+    __slots__ = 'watchdog',
+
+    def __init__(self, watchdog):
+        self.watchdog = watchdog
+
+    def begin(self, frame):
+        self.watchdog.frame_start(frame)
+
+    def mark(self, section):
+        pass
+
+    def end(self, frame):
+        self.watchdog.frame_end()
+
+class _AllocationHook:
+    __slots__ = 'tracker',
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+
+    def begin(self, frame):
+        self.tracker.begin()
+
+    def mark(self, section):
+        if section == FrameTracer.BODY:
+            self.tracker.user()
+        else:
+            self.tracker.library()
+
+    def end(self, frame):
+        self.tracker.end(frame)
+
+class _TraceHook:
+    __slots__ = 'tracer', 'last'
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.last = 0
+
+    def begin(self, frame):
+        self.tracer.frame = frame
+        self.last = perf_counter_ns()
+
+    def mark(self, section):
+        now = perf_counter_ns()
+        self.tracer.record(section, self.last, now)
+        self.last = now
+
+    def end(self, frame):
+        pass
 
 class QuickWindow(ManagedWindow, FrameLimiter):
     def __init__(self, width: int, height: int, title: str, limit: Optional[Union[int, float]] = None, **kwargs):
         ManagedWindow.__init__(self, width, height, title, **kwargs)
         FrameLimiter.__init__(self, limit)
+        self.tracer = None
+        self.vsync = None
+        self.watchdog = None
+        self.allocations = None
+
+    def enable_adaptive_vsync(self, **kwargs) -> AdaptiveVSync:
+        if self.vsync is None:
+            self.vsync = AdaptiveVSync(self, limiter=self, **kwargs)
+        return self.vsync
+
+    def disable_adaptive_vsync(self, interval: int = 1):
+        if self.vsync is not None:
+            self.set_frame_limit(self.vsync.frame_limit)
+            self.vsync = None
+            self.swap_interval(interval)
+
+    def enable_tracing(self, capacity: int = 1 << 16) -> FrameTracer:
+        if self.tracer is None:
+            self.tracer = FrameTracer(capacity)
+        return self.tracer
+
+    def disable_tracing(self):
+        self.tracer = None
+
+    # Threshold defaults to twice the frame budget, or 50ms when uncapped
+    def enable_watchdog(self, threshold: Optional[float] = None, **kwargs) -> FrameWatchdog:
+        if self.watchdog is None:
+            if threshold is None:
+                threshold = 2.0 * self.frame_step if self.frame_step else 0.05
+            self.watchdog = FrameWatchdog(threshold, **kwargs)
+            self.watchdog.start()
+        return self.watchdog
+
+    def disable_watchdog(self):
+        if self.watchdog is not None:
+            self.watchdog.stop()
+            self.watchdog = None
+
+    # Measures loop() frames; with tracing also on, the tracer's own
+    # bookkeeping is charged to quickwindow
+    def enable_allocation_tracking(self, **kwargs) -> AllocationTracker:
+        if self.allocations is None:
+            self.allocations = AllocationTracker(**kwargs)
+        return self.allocations
+
+    def disable_allocation_tracking(self):
+        if self.allocations is not None:
+            self.allocations.close()
+            self.allocations = None
+
+    @override
+    def close(self):
+        self.disable_watchdog()
+        self.disable_allocation_tracking()
+        super().close()
+
+    def span(self, name: str):
+        if self.tracer is None:
+            return _no_span
+        return self.tracer.span(name)
+
+    # Instrumentation rides on the one frame body below as hooks: begin() at
+    # frame start, mark() as each section ends, end() once the frame is done
+    def _frame_hooks(self):
+        hooks = []
+        if self.watchdog is not None:
+            hooks.append(_WatchdogHook(self.watchdog))
+        if self.allocations is not None:
+            hooks.append(_AllocationHook(self.allocations))
+        if self.tracer is not None:
+            hooks.append(_TraceHook(self.tracer))
+        return tuple(hooks)
 
     def loop(self):
+        hooks = None
+        state = None
         while not self.should_close:
-            self.poll_events()
-            yield self.limit(), self.all_events()
+            current = (self.watchdog, self.allocations, self.tracer)
+            if current != state:
+                state = current
+                hooks = self._frame_hooks()
+            vsync = self.vsync
+            latched = self.late_latch and self.frame_limit is not None
+            frame = self.frame
+            if hooks:
+                for hook in hooks:
+                    hook.begin(frame)
+            if latched:
+                dt = self.latch()
+                if hooks:
+                    for hook in hooks:
+                        hook.mark(FrameTracer.LIMITER)
+                self.poll_events()
+                if hooks:
+                    for hook in hooks:
+                        hook.mark(FrameTracer.POLL)
+            else:
+                self.poll_events()
+                if hooks:
+                    for hook in hooks:
+                        hook.mark(FrameTracer.POLL)
+                dt = self.limit()
+                if hooks:
+                    for hook in hooks:
+                        hook.mark(FrameTracer.LIMITER)
+            events = self.all_events()
+            if hooks:
+                for hook in hooks:
+                    hook.mark(FrameTracer.EVENTS)
+            yield dt, events
+            if hooks:
+                for hook in hooks:
+                    hook.mark(FrameTracer.BODY)
+            self._swap(vsync)
+            if hooks:
+                for hook in hooks:
+                    hook.mark(FrameTracer.SWAP)
+            if latched:
+                self.finish_frame()
+            if hooks:
+                for hook in hooks:
+                    hook.end(frame)
+
+    # Stage-driven alternative to loop(): the built-in "poll" and "swap"
+    # stages can be reordered, rate-divided or disabled like any other
+    def run(self, scheduler: FrameScheduler):
+        if "poll" not in scheduler:
+            scheduler.add("poll", lambda dt: self.poll_events(), "input", before=next(
+                (stage.name for stage in scheduler.stages if stage.phase == "input"), None))
+        if "swap" not in scheduler:
+            scheduler.add("swap", lambda dt: self._swap(self.vsync), "post")
+        run_frame = scheduler.run_frame
+        # The driver owns the frame number: "swap" may be rate-divided or
+        # disabled, and rate-divided stages must keep their cadence anyway
+        frame = self.frame
+        while not self.should_close:
+            watchdog = self.watchdog
+            if watchdog is not None:
+                watchdog.frame_start(frame)
+            if self.late_latch and self.frame_limit is not None:
+                run_frame(frame, self.latch())
+                self.finish_frame()
+            else:
+                run_frame(frame, self.limit())
+            frame += 1
+            if watchdog is not None:
+                watchdog.frame_end()
+
+    def _swap(self, vsync):
+        if vsync is None:
+            self.swap_buffers()
+        else:
+            vsync.before_swap()
             self.swap_buffers()
+            vsync.after_swap()
 
 __window__ = None
 
@@ -68,15 +277,29 @@ def height():
 def size():
     return __window__.size
 
+# Hands back the window's own generator so each frame resumes it directly
 @_window_attrib
 def loop():
-    for dt, events in __window__.loop():
-        yield dt, events
+    return __window__.loop()
 
 @_window_attrib
 def events():
     return __window__.events()
 
+@_window_attrib
+def text():
+    return __window__.text
+
+def run(scheduler: FrameScheduler):
+    if __window__ is None:
+        raise RuntimeError("No window created")
+    __window__.run(scheduler)
+
+def span(name: str):
+    if __window__ is None:
+        raise RuntimeError("No window created")
+    return __window__.span(name)
+
 @contextmanager
 def quick_window(width: Optional[int] = 640,
                  height: Optional[int] = 480,
@@ -86,7 +309,9 @@ def quick_window(width: Optional[int] = 640,
                  versions: Optional[Tuple[int, int, bool]] = None,
                  monitor: Optional[Monitor] = None,
                  shared: Optional[Window] = None,
-                 hints: Optional[Dict] = None):
+                 hints: Optional[Dict] = None,
+                 char_events: bool = False,
+                 late_latch: bool = False):
     global __window__
     if __window__ is not None:
         raise RuntimeError("Can only have 1 instance of quick_window()")
@@ -109,5 +334,10 @@ def quick_window(width: Optional[int] = 640,
             print("%s.%s %s: %s" % (vermaj, vermin, iscore_str, e))
     else:
         raise SystemExit("Proper OpenGL 3.x context not found")
-    __window__ = QuickWindow(width, height, title, frame_limit, monitor=monitor, shared=shared, hints=hints, quit_key=quit_key)
-    yield __window__
+    __window__ = QuickWindow(width, height, title, frame_limit, monitor=monitor, shared=shared, hints=hints, quit_key=quit_key, char_events=char_events)
+    __window__.set_late_latch(late_latch)
+    try:
+        yield __window__
+    finally:
+        __window__.close()
+        __window__ = None
@@ -0,0 +1,177 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from .window import ManagedWindow
+from .event import *
+from dataclasses import fields
+from struct import Struct
+from time import perf_counter, sleep
+import mmap
+
+__all__ = ["InputRecorder", "InputReplayer"]
+
+_MAGIC = b"QWIR\x02\x00\x00\x00"
+
+# type id, frames and seconds since recording started
+_header = Struct("<BId")
+
+# type id: (event class, payload layout, ManagedWindow callback)
+_event_layouts = {
+    1:  (KeyEvent,              Struct("<iiii"),    "key_callback"),
+    2:  (CharEvent,             Struct("<I"),       "codepoint_callback"),
+    3:  (ScrollEvent,           Struct("<dd"),      "scroll_callback"),
+    4:  (MouseButtonEvent,      Struct("<iii"),     "mouse_button_callback"),
+    5:  (CursorEnterEvent,      Struct("<?"),       "cursor_enter_callback"),
+    6:  (CursorPosEvent,        Struct("<dd"),      "cursor_pos_callback"),
+    7:  (WindowSizeEvent,       Struct("<ii"),      "window_size_callback"),
+    8:  (WindowPosEvent,        Struct("<ii"),      "window_pos_callback"),
+    9:  (WindowCloseEvent,      Struct("<"),        "window_close_callback"),
+    10: (WindowRefreshEvent,    Struct("<"),        "window_refresh_callback"),
+    11: (WindowFocusEvent,      Struct("<?"),       "window_focus_callback"),
+    12: (WindowIconifyEvent,    Struct("<?"),       "window_iconify_callback"),
+    13: (FrameBufferSizeEvent,  Struct("<ii"),      "framebuffer_size_callback"),
+}
+
+def _event_getter(cls):
+    names = tuple(f.name for f in fields(cls) if f.name != 'timestamp')
+    if cls is CharEvent:
+        return lambda event: (ord(event.char),)
+    return lambda event: tuple(getattr(event, name) for name in names)
+
+_event_ids = {cls: (tid, layout, _event_getter(cls)) for tid, (cls, layout, _) in _event_layouts.items()}
+
+class InputRecorder:
+    def __init__(self, window: ManagedWindow, path: str, buffer_size: int = 1 << 16):
+        self.window = window
+        self.path = path
+        self.count = 0
+        self._file = open(path, "wb")
+        self._file.write(_MAGIC)
+        self._buffer = bytearray()
+        self._buffer_size = buffer_size
+        self._start = perf_counter()
+        self._start_frame = window.frame
+        window.add_listener(self._record)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _record(self, window, event):
+        ids = _event_ids.get(type(event))
+        if ids is None:
+            return
+        tid, layout, values = ids
+        buffer = self._buffer
+        buffer += _header.pack(tid, window.frame - self._start_frame, perf_counter() - self._start)
+        buffer += layout.pack(*values(event))
+        self.count += 1
+        if len(buffer) >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.window.remove_listener(self._record)
+        self.flush()
+        self._file.close()
+
+class InputReplayer:
+    def __init__(self, window: ManagedWindow, path: str, realtime: bool = False, frame_locked: bool = True):
+        self.window = window
+        self.path = path
+        self.realtime = realtime
+        self.frame_locked = frame_locked
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(_MAGIC)] != _MAGIC:
+            self.close()
+            raise ValueError(f"\"{path}\" is not an input recording")
+        self._offset = len(_MAGIC)
+        self._next = self._peek()
+        self._origin = None
+        self._start = None
+        self._start_frame = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _peek(self):
+        if self._offset + _header.size > len(self._map):
+            return None
+        return _header.unpack_from(self._map, self._offset)
+
+    @property
+    def finished(self):
+        return self._next is None
+
+    # Call once per frame. Frame-locked playback feeds the events recorded
+    # for the window's current frame, counted from the first feed(), so
+    # input lands on the same rendered frames as when it was recorded;
+    # otherwise every call feeds the next recorded frame that has events,
+    # which only suits timing runs. Returns the last recorded frame fed,
+    # or None when nothing was due
+    def feed(self):
+        if self._next is None:
+            return None
+        window = self.window
+        if self._start_frame is None:
+            self._start_frame = window.frame
+            self._origin = 0.0
+            self._start = perf_counter()
+        if self.frame_locked:
+            due = window.frame - self._start_frame
+        else:
+            due = self._next[1]
+        fed = None
+        while self._next is not None and self._next[1] <= due:
+            tid, fed, stamp = self._next
+            self._offset += _header.size
+            _, layout, callback = _event_layouts[tid]
+            values = layout.unpack_from(self._map, self._offset)
+            self._offset += layout.size
+            if self.realtime:
+                delay = (stamp - self._origin) - (perf_counter() - self._start)
+                if delay > 0:
+                    sleep(delay)
+            getattr(window, callback)(*values)
+            self._next = self._peek()
+        return fed
+
+    def close(self):
+        if not self._file.closed:
+            self._map.close()
+            self._file.close()
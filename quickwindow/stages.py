@@ -0,0 +1,175 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from time import perf_counter_ns
+from typing import Callable, Optional
+
+__all__ = ["Stage", "FrameScheduler"]
+
+class Stage:
+    __slots__ = ('name', 'func', 'phase', 'every', 'offset', 'enabled',
+                 'calls', 'total_ns', 'last_ns', 'max_ns')
+
+    def __init__(self, name: str, func: Callable, phase: str, every: int = 1, offset: int = 0, enabled: bool = True):
+        self.name = name
+        self.func = func
+        self.phase = phase
+        self.every = every
+        self.offset = offset
+        self.enabled = enabled
+        self.calls = 0
+        self.total_ns = 0
+        self.last_ns = 0
+        self.max_ns = 0
+
+    @property
+    def mean_ns(self):
+        return self.total_ns / self.calls if self.calls else 0.0
+
+class FrameScheduler:
+    PHASES = ("input", "update", "render", "post")
+
+    def __init__(self, timing: bool = True):
+        self.timing = timing
+        self._stages = {phase: [] for phase in self.PHASES}
+        self._by_name = {}
+        self._order = ()
+
+    def __getitem__(self, name: str) -> Stage:
+        return self._by_name[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def add(self, name: str, func: Callable, phase: str = "update",
+            every: int = 1, offset: int = 0, enabled: bool = True,
+            before: Optional[str] = None, after: Optional[str] = None) -> Stage:
+        if phase not in self._stages:
+            raise ValueError(f"Invalid stage phase \"{phase}\"")
+        if name in self._by_name:
+            raise ValueError(f"Stage \"{name}\" already exists")
+        if every < 1:
+            raise ValueError("Stage rate divisor must be at least 1")
+        index = self._position(phase, before, after)
+        stage = Stage(name, func, phase, every, offset % every, enabled)
+        self._by_name[name] = stage
+        self._stages[phase].insert(index, stage)
+        self._compile()
+        return stage
+
+    def stage(self, phase: str = "update", name: Optional[str] = None, **kwargs):
+        def decorator(func):
+            self.add(name or func.__name__, func, phase, **kwargs)
+            return func
+        return decorator
+
+    # Validates the anchor before anything is mutated; `moving` is left out
+    # of the phase's list so a stage can be positioned relative to its peers
+    def _position(self, phase, before, after, moving=None):
+        stages = [stage for stage in self._stages[phase] if stage is not moving]
+        anchor = before if before is not None else after
+        if anchor is None:
+            return len(stages)
+        target = self._by_name.get(anchor)
+        if target is None:
+            raise ValueError(f"Unknown stage \"{anchor}\"")
+        if target is moving:
+            raise ValueError(f"Stage \"{anchor}\" cannot be placed relative to itself")
+        if target.phase != phase:
+            raise ValueError(f"Stage \"{anchor}\" is in phase \"{target.phase}\", not \"{phase}\"")
+        index = stages.index(target)
+        return index if before is not None else index + 1
+
+    def remove(self, name: str):
+        stage = self._by_name.pop(name)
+        self._stages[stage.phase].remove(stage)
+        self._compile()
+
+    def move(self, name: str, phase: Optional[str] = None,
+             before: Optional[str] = None, after: Optional[str] = None):
+        stage = self._by_name[name]
+        if phase is None:
+            phase = stage.phase
+        elif phase not in self._stages:
+            raise ValueError(f"Invalid stage phase \"{phase}\"")
+        index = self._position(phase, before, after, stage)
+        self._stages[stage.phase].remove(stage)
+        stage.phase = phase
+        self._stages[phase].insert(index, stage)
+        self._compile()
+
+    def enable(self, name: str, enabled: bool = True):
+        self._by_name[name].enabled = enabled
+        self._compile()
+
+    def disable(self, name: str):
+        self.enable(name, False)
+
+    def set_rate(self, name: str, every: int, offset: int = 0):
+        if every < 1:
+            raise ValueError("Stage rate divisor must be at least 1")
+        stage = self._by_name[name]
+        stage.every = every
+        stage.offset = offset % every
+        self._compile()
+
+    # Flattened, enabled-only run order so run_frame() never looks at phases
+    def _compile(self):
+        self._order = tuple((stage.func, stage.every, stage.offset, stage)
+                            for phase in self.PHASES
+                            for stage in self._stages[phase] if stage.enabled)
+
+    def run_frame(self, frame: int, dt: float):
+        if not self.timing:
+            for func, every, offset, _ in self._order:
+                if every == 1 or frame % every == offset:
+                    func(dt)
+            return
+        for func, every, offset, stage in self._order:
+            if every == 1 or frame % every == offset:
+                start = perf_counter_ns()
+                func(dt)
+                elapsed = perf_counter_ns() - start
+                stage.calls += 1
+                stage.total_ns += elapsed
+                stage.last_ns = elapsed
+                if elapsed > stage.max_ns:
+                    stage.max_ns = elapsed
+
+    @property
+    def stages(self):
+        return [stage for phase in self.PHASES for stage in self._stages[phase]]
+
+    def timings(self):
+        return {stage.name: {'phase': stage.phase,
+                             'enabled': stage.enabled,
+                             'every': stage.every,
+                             'calls': stage.calls,
+                             'mean_ms': stage.mean_ns / 1e6,
+                             'last_ms': stage.last_ns / 1e6,
+                             'max_ms': stage.max_ns / 1e6}
+                for stage in self.stages}
+
+    def reset_timings(self):
+        for stage in self._by_name.values():
+            stage.calls = stage.total_ns = stage.last_ns = stage.max_ns = 0
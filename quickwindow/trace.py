@@ -0,0 +1,123 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from array import array
+from time import perf_counter_ns
+from typing import Union, TextIO
+import json
+import os
+import threading
+
+__all__ = ["FrameTracer"]
+
+class _Span:
+    __slots__ = 'tracer', 'name', 'start'
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer.record(self.name, self.start, perf_counter_ns())
+        return False
+
+class FrameTracer:
+    POLL = 0
+    LIMITER = 1
+    EVENTS = 2
+    BODY = 3
+    SWAP = 4
+
+    def __init__(self, capacity: int = 1 << 16):
+        self.capacity = capacity
+        self.frame = 0
+        self._names = ["poll", "limiter", "events", "body", "swap"]
+        self._ids = {name: i for i, name in enumerate(self._names)}
+        self._name = array('H', [0]) * capacity
+        self._frame = array('L', [0]) * capacity
+        self._start = array('q', [0]) * capacity
+        self._end = array('q', [0]) * capacity
+        self._thread = array('L', [0]) * capacity
+        self._index = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def intern(self, name: str) -> int:
+        nid = self._ids.get(name)
+        if nid is None:
+            nid = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return nid
+
+    def record(self, name: Union[str, int], start: int, end: int):
+        if name.__class__ is str:
+            name = self.intern(name)
+        i = self._index
+        self._name[i] = name
+        self._frame[i] = self.frame
+        self._start[i] = start
+        self._end[i] = end
+        self._thread[i] = threading.get_ident() & 0xFFFFFFFF
+        self._index = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, self.intern(name))
+
+    def clear(self):
+        self._index = 0
+        self._count = 0
+
+    def spans(self):
+        first = (self._index - self._count) % self.capacity
+        for n in range(self._count):
+            i = (first + n) % self.capacity
+            yield (self._names[self._name[i]], self._frame[i],
+                   self._start[i], self._end[i], self._thread[i])
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        return {"traceEvents": [{"name": name,
+                                 "cat": "quickwindow",
+                                 "ph": "X",
+                                 "ts": start / 1000.0,
+                                 "dur": (end - start) / 1000.0,
+                                 "pid": pid,
+                                 "tid": tid,
+                                 "args": {"frame": frame}}
+                                for name, frame, start, end, tid in self.spans()],
+                "displayTimeUnit": "ms"}
+
+    def export_chrome(self, file: Union[str, TextIO]):
+        if isinstance(file, str):
+            with open(file, "w") as f:
+                json.dump(self.chrome_trace(), f)
+        else:
+            json.dump(self.chrome_trace(), file)
@@ -0,0 +1,108 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from . import glfw as api
+from .window import Window, Monitor, FrameLimiter
+from time import perf_counter
+from typing import Optional
+
+__all__ = ["AdaptiveVSync"]
+
+_tear_extensions = (b"WGL_EXT_swap_control_tear", b"GLX_EXT_swap_control_tear")
+
+class AdaptiveVSync:
+    VSYNC = 1
+    ADAPTIVE = -1
+    LIMITED = 0
+
+    def __init__(self, window: Window,
+                 limiter: Optional[FrameLimiter] = None,
+                 refresh_rate: Optional[int] = None,
+                 margin: float = 0.1,
+                 hysteresis: int = 30,
+                 smoothing: float = 0.1):
+        self.window = window
+        self.limiter = limiter
+        # The caller's own cap; it stays in force in every mode
+        self.frame_limit = limiter.frame_limit if limiter is not None else None
+        self.margin = margin
+        self.hysteresis = hysteresis
+        self.smoothing = smoothing
+        if refresh_rate is None:
+            monitor = window.monitor or Monitor.primary()
+            refresh_rate = monitor.video_mode.refresh_rate if monitor else 60
+        self.refresh_rate = refresh_rate or 60
+        self.period = 1.0 / self.refresh_rate
+        with window:
+            self.adaptive_supported = any(api.glfwExtensionSupported(ext) for ext in _tear_extensions)
+        self.frame_time = self.period * 0.5
+        self.interval = None
+        self._pending = None
+        self._streak = 0
+        self._swap_end = None
+        self.apply(AdaptiveVSync.VSYNC)
+
+    def apply(self, interval: int):
+        if interval == self.interval:
+            return
+        self.window.swap_interval(interval)
+        if self.limiter is not None:
+            limit = self.frame_limit
+            if interval == AdaptiveVSync.LIMITED:
+                limit = self.refresh_rate if limit is None else min(limit, self.refresh_rate)
+            self.limiter.set_frame_limit(limit)
+        self.interval = interval
+
+    def _desired(self):
+        if self.frame_time <= self.period * (1.0 - self.margin):
+            return AdaptiveVSync.VSYNC
+        if self.adaptive_supported:
+            return AdaptiveVSync.ADAPTIVE
+        return AdaptiveVSync.LIMITED
+
+    # Feed the CPU/GPU work time of a frame, excluding any time spent blocked in swap
+    def update(self, work: float):
+        self.frame_time += (work - self.frame_time) * self.smoothing
+        desired = self._desired()
+        if desired == self.interval:
+            self._pending = None
+            self._streak = 0
+            return
+        if desired != self._pending:
+            self._pending = desired
+            self._streak = 0
+        self._streak += 1
+        if self._streak >= self.hysteresis:
+            self.apply(desired)
+            self._pending = None
+            self._streak = 0
+
+    def before_swap(self):
+        if self._swap_end is not None:
+            work = perf_counter() - self._swap_end
+            if self.limiter is not None:
+                work -= self.limiter.frame_wait
+            self.update(work)
+
+    def after_swap(self):
+        self._swap_end = perf_counter()
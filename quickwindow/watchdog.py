@@ -0,0 +1,169 @@
+# MIT License
+#
+# Copyright (C) 2013 Roman Valov
+# Copyright (c) 2025 George Watson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from collections import Counter, deque
+from time import perf_counter, sleep
+from typing import Optional, Callable, Union, TextIO
+import os
+import sys
+import threading
+
+__all__ = ["FrameWatchdog", "SlowFrame"]
+
+class SlowFrame:
+    __slots__ = 'frame', 'start', 'duration', 'samples'
+
+    def __init__(self, frame, start):
+        self.frame = frame
+        self.start = start
+        self.duration = 0.0
+        self.samples = Counter()
+
+    def __repr__(self):
+        return (f"SlowFrame(frame={self.frame}, duration={self.duration * 1000.0:.2f}ms, "
+                f"samples={sum(self.samples.values())})")
+
+def _collapse(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+class FrameWatchdog:
+    def __init__(self,
+                 threshold: float = 0.05,
+                 interval: float = 0.002,
+                 capacity: int = 64,
+                 on_slow_frame: Optional[Callable[[SlowFrame], None]] = None):
+        self.threshold = threshold
+        self.interval = interval
+        self.on_slow_frame = on_slow_frame
+        self.slow_frames = deque(maxlen=capacity)
+        self._frame = 0
+        self._start = None
+        self._slow = None
+        self._lock = threading.Lock()
+        self._target = None
+        self._thread = None
+        self._running = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    # Watches the calling thread unless another thread id is given
+    def start(self, thread_id: Optional[int] = None):
+        if self._thread is not None:
+            return
+        self._target = thread_id if thread_id is not None else threading.get_ident()
+        self._running = True
+        self._thread = threading.Thread(target=self._watch, name="quickwindow-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        thread = self._thread
+        if thread is None:
+            return
+        self._running = False
+        thread.join()
+        self._thread = None
+        self.frame_end()
+
+    # The per-frame cost on the watched thread is two attribute stores and
+    # one uncontended lock; the watcher only holds the lock while it checks
+    # the frame and files a sample, so a SlowFrame can never outlive its frame
+    def frame_start(self, frame: int):
+        self._frame = frame
+        self._start = perf_counter()
+
+    def frame_end(self):
+        with self._lock:
+            self._start = None
+            slow = self._slow
+            self._slow = None
+        if slow is None:
+            return
+        slow.duration = perf_counter() - slow.start
+        self.slow_frames.append(slow)
+        if self.on_slow_frame is not None:
+            self.on_slow_frame(slow)
+
+    def _watch(self):
+        while self._running:
+            threshold = self.threshold
+            interval = self.interval
+            start = self._start
+            if start is None:
+                sleep(threshold)
+                continue
+            elapsed = perf_counter() - start
+            if elapsed < threshold:
+                # Normal frames finish before the watcher ever wakes up again
+                sleep(threshold - elapsed)
+                continue
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                sleep(interval)
+                continue
+            stack = _collapse(frame)
+            del frame
+            with self._lock:
+                if self._start != start:
+                    continue
+                slow = self._slow
+                if slow is None:
+                    slow = self._slow = SlowFrame(self._frame, start)
+                slow.samples[stack] += 1
+            sleep(interval)
+
+    def clear(self):
+        self.slow_frames.clear()
+
+    # Folded stacks as consumed by flamegraph.pl, speedscope and inferno;
+    # per_frame roots each stack under its frame number
+    def collapsed(self, per_frame: bool = False):
+        if per_frame:
+            lines = []
+            for slow in self.slow_frames:
+                root = f"frame {slow.frame} ({slow.duration * 1000.0:.1f}ms)"
+                lines.extend(f"{root};{stack} {count}" for stack, count in slow.samples.items())
+            return lines
+        total = Counter()
+        for slow in self.slow_frames:
+            total.update(slow.samples)
+        return [f"{stack} {count}" for stack, count in total.most_common()]
+
+    def write_collapsed(self, file: Union[str, TextIO], per_frame: bool = False):
+        lines = self.collapsed(per_frame)
+        if isinstance(file, str):
+            with open(file, "w") as f:
+                f.writelines(line + "\n" for line in lines)
+        else:
+            file.writelines(line + "\n" for line in lines)
@@ -23,12 +23,21 @@
 
 from . import glfw as api
 from .event import *
+from .latency import LatencyTracker
 from threading import local
 from typing import Optional, Union, Dict, override
 import atexit
 from queue import Queue
+from collections import deque
+from itertools import chain, count
+from bisect import bisect_left, bisect_right
+from array import array
+from time import perf_counter, sleep
+import sys
+import weakref
+from contextlib import contextmanager
 
-__all__ = ["Hints", "Keys", "Mice", "Joystick", "Monitor", "VideoMode", "Window", "ManagedWindow", "FrameLimiter"]
+__all__ = ["Hints", "Keys", "Mice", "Joystick", "Monitor", "VideoMode", "VideoModeIndex", "JoystickPoller", "Window", "ManagedWindow", "FrameLimiter", "Clipboard"]
 
 if bytes is str:
     _unichr = unichr
@@ -37,6 +46,8 @@ else:
     _unichr = chr
     _unistr = str
 
+_utf32 = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
 def _utf(obj):
     if bytes is not str:
         obj = obj.encode()
@@ -50,6 +61,15 @@ def _str(obj):
 class WindowType:
     pass
 
+_UNKNOWN = object()
+
+# Stands in for a weak reference when no context is current
+def _no_context():
+    return None
+
+def _context_ref(window):
+    return _no_context if window is None else weakref.ref(window)
+
 class _HintsBase:
     _hint_map_ = {
         'resizable':           api.GLFW_RESIZABLE,
@@ -259,9 +279,117 @@ class Joystick:
     def buttons(self):
         return api.glfwGetJoystickButtons(self.joyidx)
 
+    @property
+    def hats(self):
+        return api.glfwGetJoystickHats(self.joyidx)
+
+    @property
+    def is_gamepad(self):
+        return bool(api.glfwJoystickIsGamepad(self.joyidx))
+
+    @property
+    def gamepad_name(self):
+        name = api.glfwGetGamepadName(self.joyidx)
+        return _str(name) if name else None
+
+    def gamepad_state(self, state: Optional[api.GLFWgamepadstate] = None):
+        if state is None:
+            state = api.GLFWgamepadstate()
+        if not api.glfwGetGamepadState(self.joyidx, state):
+            return None
+        return state
+
+class JoystickPoller:
+    _pollers_ = []
+    # Other readers told about connects and disconnects, such as Gamepads
+    _watchers_ = weakref.WeakSet()
+    _callback_ = None
+
+    def __init__(self, emit, rate: Optional[Union[int, float]] = None, threshold: float = 0.0):
+        self.emit = emit
+        self.interval = 0.0 if not rate else 1.0 / rate
+        self.threshold = threshold
+        self._next_poll = 0.0
+        self._axes = {}
+        self._buttons = {}
+        JoystickPoller._watch()
+        # One full scan to pick up pads connected before the callback existed
+        for joy in range(api.GLFW_JOYSTICK_LAST + 1):
+            if api.glfwJoystickPresent(joy):
+                self._connect(joy)
+        JoystickPoller._pollers_.append(self)
+
+    @staticmethod
+    def _on_joystick_event(joy, event):
+        for poller in JoystickPoller._pollers_:
+            if event == api.GLFW_CONNECTED:
+                poller._connect(joy)
+            else:
+                poller._disconnect(joy)
+            poller.emit(JoystickConnectEvent(joystick=joy, status=event == api.GLFW_CONNECTED))
+        for watcher in list(JoystickPoller._watchers_):
+            watcher._on_joystick(joy, event == api.GLFW_CONNECTED)
+
+    @staticmethod
+    def _watch():
+        if JoystickPoller._callback_ is None:
+            JoystickPoller._callback_ = api.GLFWjoystickfun(JoystickPoller._on_joystick_event)
+            api.glfwSetJoystickCallback(JoystickPoller._callback_)
+
+    def _connect(self, joy):
+        self._axes[joy] = api.glfwGetJoystickAxes(joy)
+        self._buttons[joy] = api.glfwGetJoystickButtons(joy)
+
+    def _disconnect(self, joy):
+        self._axes.pop(joy, None)
+        self._buttons.pop(joy, None)
+
+    @property
+    def connected(self):
+        return list(self._axes)
+
+    def state(self, joy):
+        return self._axes.get(joy), self._buttons.get(joy)
+
+    def poll(self, now: Optional[float] = None):
+        if not self._axes:
+            return
+        if self.interval:
+            now = api.glfwGetTime() if now is None else now
+            if now < self._next_poll:
+                return
+            self._next_poll = now + self.interval
+        emit = self.emit
+        threshold = self.threshold
+        for joy, prev_axes in self._axes.items():
+            axes = api.glfwGetJoystickAxes(joy)
+            if axes != prev_axes:
+                for i, value in enumerate(axes):
+                    if i >= len(prev_axes) or abs(value - prev_axes[i]) > threshold:
+                        emit(JoystickAxisEvent(joystick=joy, axis=i, value=value))
+                    else:
+                        axes[i] = prev_axes[i]
+                self._axes[joy] = axes
+            buttons = api.glfwGetJoystickButtons(joy)
+            prev_buttons = self._buttons[joy]
+            if buttons != prev_buttons:
+                for i, action in enumerate(buttons):
+                    if i >= len(prev_buttons) or action != prev_buttons[i]:
+                        emit(JoystickButtonEvent(joystick=joy, button=i, action=action))
+                self._buttons[joy] = buttons
+
+    def close(self):
+        if self in JoystickPoller._pollers_:
+            JoystickPoller._pollers_.remove(self)
+
 def _monitor_obj(moni):
-    monobj = super(Monitor, Monitor).__new__(Monitor)
-    monobj.handle = moni.get_void_p()
+    handle = moni.get_void_p()
+    monobj = Monitor._registry_.get(handle.value)
+    if monobj is None:
+        monobj = super(Monitor, Monitor).__new__(Monitor)
+        monobj.handle = handle
+        monobj._cache = {}
+        Monitor._registry_[handle.value] = monobj
     return monobj
 
 class VideoMode:
@@ -273,8 +401,98 @@ class VideoMode:
         self.bits = (vm.redBits, vm.greenBits, vm.blueBits)
         self.refresh_rate = vm.refreshRate
 
+class VideoModeIndex:
+    def __init__(self, modes):
+        grouped = {}
+        for mode in modes:
+            grouped.setdefault((mode.width, mode.height), []).append(mode)
+        self._resolutions = sorted(grouped, key=lambda res: (res[0] * res[1], res[0]))
+        self._areas = [w * h for w, h in self._resolutions]
+        self._modes = {}
+        self._rates = {}
+        for res, group in grouped.items():
+            group.sort(key=lambda mode: (mode.refresh_rate, sum(mode.bits)))
+            self._modes[res] = tuple(group)
+            self._rates[res] = [mode.refresh_rate for mode in group]
+
+    def __len__(self):
+        return sum(len(group) for group in self._modes.values())
+
+    def __bool__(self):
+        return bool(self._resolutions)
+
+    @property
+    def resolutions(self):
+        return list(self._resolutions)
+
+    @property
+    def native(self):
+        return self._resolutions[-1] if self._resolutions else None
+
+    def modes(self, width, height):
+        return self._modes.get((width, height), ())
+
+    def nearest_resolution(self, width, height):
+        if (width, height) in self._modes:
+            return (width, height)
+        if not self._resolutions:
+            return None
+        area = width * height
+        i = bisect_left(self._areas, area)
+        candidates = self._resolutions[max(0, i - 1):i + 1]
+        return min(candidates, key=lambda res: (abs(res[0] * res[1] - area),
+                                                abs(res[0] - width) + abs(res[1] - height)))
+
+    def _pick(self, res, refresh_rate, bits):
+        group = self._modes[res]
+        rates = self._rates[res]
+        if refresh_rate is None:
+            rate = rates[-1]
+        else:
+            i = bisect_left(rates, refresh_rate)
+            if i == len(rates):
+                rate = rates[-1]
+            elif i == 0 or rates[i] == refresh_rate:
+                rate = rates[i]
+            else:
+                below, above = rates[i - 1], rates[i]
+                rate = below if refresh_rate - below < above - refresh_rate else above
+        lo = bisect_left(rates, rate)
+        hi = bisect_right(rates, rate)
+        if bits is not None:
+            for mode in group[lo:hi]:
+                if mode.bits == tuple(bits):
+                    return mode
+        return group[hi - 1]
+
+    def nearest(self, width, height, refresh_rate=None, bits=None):
+        res = self.nearest_resolution(width, height)
+        if res is None:
+            return None
+        return self._pick(res, refresh_rate, bits)
+
+    def highest_refresh(self, width=None, height=None, bits=None):
+        res = self.native if width is None or height is None else self.nearest_resolution(width, height)
+        if res is None:
+            return None
+        return self._pick(res, None, bits)
+
+def _cached(func):
+    name = func.__name__
+    def wrapper(self):
+        Monitor._watch()
+        try:
+            return self._cache[name]
+        except KeyError:
+            value = self._cache[name] = func(self)
+            return value
+    return property(wrapper, doc=func.__doc__)
+
 class Monitor:
     _callback_ = None
+    _user_callback_ = None
+    _registry_ = {}
+    _topology_ = {}
 
     CONNECTED = api.GLFW_CONNECTED
     DISCONNECTED = api.GLFW_DISCONNECTED
@@ -285,15 +503,36 @@ class Monitor:
     def __ne__(self, other):
         return not (self == other)
 
+    def __hash__(self):
+        return hash(self.handle.value)
+
+    @staticmethod
+    def _on_monitor_event(handle, event):
+        monitor = _monitor_obj(handle)
+        Monitor.invalidate()
+        if Monitor._user_callback_ is not None:
+            Monitor._user_callback_(monitor, event)
+        if event == api.GLFW_DISCONNECTED:
+            Monitor._registry_.pop(monitor.handle.value, None)
+
+    # The GLFW monitor callback is the only thing that invalidates the cache,
+    # so it stays installed for as long as anything has been cached
+    @staticmethod
+    def _watch():
+        if Monitor._callback_ is None:
+            Monitor._callback_ = api.GLFWmonitorfun(Monitor._on_monitor_event)
+            api.glfwSetMonitorCallback(Monitor._callback_)
+
     @staticmethod
     def set_callback(callback):
-        if not callback:
-            Monitor._callback_ = None
-        else:
-            def wrap(handle, *args, **kwargs):
-                callback(_monitor_obj(handle), *args, **kwargs)
-            Monitor._callback_ = api.GLFWmonitorfun(wrap)
-        api.glfwSetMonitorCallback(Monitor._callback_)
+        Monitor._user_callback_ = callback or None
+        Monitor._watch()
+
+    @staticmethod
+    def invalidate():
+        Monitor._topology_.clear()
+        for monitor in Monitor._registry_.values():
+            monitor._cache.clear()
 
     def __init__(self):
         raise TypeError("Objects of this class cannot be created")
@@ -302,21 +541,30 @@ class Monitor:
     def pos(self):
         return api.glfwGetMonitorPos(self.handle)
 
-    @property
+    @_cached
     def name(self):
         return _str(api.glfwGetMonitorName(self.handle))
 
-    @property
+    @_cached
     def physical_size(self):
         return api.glfwGetMonitorPhysicalSize(self.handle)
 
-    @property
+    @_cached
     def video_mode(self):
         return VideoMode(api.glfwGetVideoMode(self.handle))
 
-    @property
+    @_cached
     def video_modes(self):
-        return [VideoMode(vm) for vm in api.glfwGetVideoModes(self.handle)]
+        return tuple(VideoMode(vm) for vm in api.glfwGetVideoModes(self.handle))
+
+    @_cached
+    def mode_index(self):
+        return VideoModeIndex(self.video_modes)
+
+    def best_mode(self, width=None, height=None, refresh_rate=None, bits=None):
+        if width is None or height is None:
+            width, height = self.mode_index.native or (0, 0)
+        return self.mode_index.nearest(width, height, refresh_rate, bits)
 
     def set_gamma(self, gamma):
         api.glfwSetGamma(self.handle, gamma)
@@ -331,11 +579,46 @@ class Monitor:
 
     @staticmethod
     def all():
-        return [_monitor_obj(moni) for moni in api.glfwGetMonitors()]
+        Monitor._watch()
+        monitors = Monitor._topology_.get('all')
+        if monitors is None:
+            monitors = Monitor._topology_['all'] = tuple(_monitor_obj(moni) for moni in api.glfwGetMonitors())
+        return list(monitors)
 
     @staticmethod
     def primary():
-        return _monitor_obj(api.glfwGetPrimaryMonitor())
+        Monitor._watch()
+        if 'primary' not in Monitor._topology_:
+            moni = api.glfwGetPrimaryMonitor()
+            Monitor._topology_['primary'] = _monitor_obj(moni) if bool(moni) else None
+        return Monitor._topology_['primary']
+
+class Clipboard:
+    def __init__(self, window, cached: bool = True):
+        self.window = window
+        self.cached = cached
+        self._value = None
+
+    # Only a cache miss reaches glfwGetClipboardString, which on X11 is a
+    # blocking round trip to the selection owner
+    @property
+    def value(self):
+        if self._value is None or not self.cached:
+            return self.refresh()
+        return self._value
+
+    @value.setter
+    def value(self, buffer):
+        api.glfwSetClipboardString(self.window.handle, _utf(buffer))
+        self._value = buffer
+
+    def refresh(self):
+        buffer = api.glfwGetClipboardString(self.window.handle)
+        self._value = _str(buffer) if buffer else ''
+        return self._value
+
+    def invalidate(self):
+        self._value = None
 
 _glfw_initialized = False
 
@@ -347,9 +630,27 @@ def init_glfw():
         atexit.register(api.glfwTerminate)
         _glfw_initialized = True
 
+# Runs from close(), or when a window is collected without being closed:
+# GLFW must stop calling into the instance's ctypes thunks before they go
+def _destroy_window(handle, share_group):
+    for setter in Window._callback_setters_:
+        setter(handle, None)
+    api.glfwDestroyWindow(handle)
+    Window._instance_.pop(handle.value, None)
+    gl = sys.modules.get(__package__ + '.gl')
+    if gl is not None and not any(window.share_group == share_group
+                                  for window in list(Window._instance_.values())):
+        gl._loader.release_group(share_group)
+
+# Share group ids are never reused, unlike the handle address of a
+# group's first window once GLFW frees it
+_share_groups = count(1)
+
 class Window(WindowType):
-    _instance_ = {}
+    # Keyed by GLFW handle; closing or dropping a window releases its entry
+    _instance_ = weakref.WeakValueDictionary()
     _contexts_ = local()
+    _hints_ = {}
 
     def __init__(self, width: int, height: int, title: str,
                  monitor: Optional[Monitor] = None,
@@ -364,7 +665,9 @@ class Window(WindowType):
         win_handle = api.glfwCreateWindow(width, height, _utf(title), mon_handle, shr_handle)
 
         self.handle = win_handle.get_void_p()
+        self.share_group = shared.share_group if shared else next(_share_groups)
         self.__class__._instance_[self.handle.value] = self
+        self._finalizer = weakref.finalize(self, _destroy_window, self.handle, self.share_group)
         self.make_current()
 
         self.mice = Mice(self.handle)
@@ -377,27 +680,43 @@ class Window(WindowType):
             self.set_callbacks(**callbacks)
 
     def __enter__(self):
-        if not hasattr(Window._contexts_, 'ctxstack'):
-            Window._contexts_.ctxstack = []
-        Window._contexts_.ctxstack += [self.find_current()]
-
-        api.glfwMakeContextCurrent(self.handle)
+        ctx = Window._contexts_
+        if not hasattr(ctx, 'ctxstack'):
+            ctx.ctxstack = []
+        ctx.ctxstack.append(self.find_current())
+        Window._set_current(self)
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
         if not Window._contexts_.ctxstack:
             raise RuntimeError('Corrupted context stack')
 
-        _ctx = Window._contexts_.ctxstack.pop()
-        api.glfwMakeContextCurrent(_ctx and _ctx.handle or _ctx)
+        Window._set_current(Window._contexts_.ctxstack.pop())
         return False
 
+    # The current context is tracked per thread so that redundant switches
+    # never reach the driver; anything that changes the context behind
+    # quickwindow's back must call forget_current(). The window is held
+    # weakly so that dropping it while current still lets it be collected
+    @staticmethod
+    def _set_current(_ctx):
+        ctx = Window._contexts_
+        current = getattr(ctx, 'current', _UNKNOWN)
+        if current is not _UNKNOWN and current() is _ctx:
+            return
+        api.glfwMakeContextCurrent(_ctx and _ctx.handle or _ctx)
+        ctx.current = _context_ref(_ctx)
+
+    @staticmethod
+    def forget_current():
+        Window._contexts_.current = _UNKNOWN
+
     @classmethod
     def swap_current(cls, _ctx):
         if hasattr(Window._contexts_, 'ctxstack') and \
                 Window._contexts_.ctxstack:
             raise RuntimeError('This function cannot be used inside `with`')
-        api.glfwMakeContextCurrent(_ctx and _ctx.handle or _ctx)
+        Window._set_current(_ctx)
         return _ctx
 
     def make_current(self):
@@ -405,14 +724,70 @@ class Window(WindowType):
 
     @classmethod
     def find_current(cls):
+        current = getattr(Window._contexts_, 'current', _UNKNOWN)
+        if current is not _UNKNOWN:
+            return current()
         find_handle = api.glfwGetCurrentContext().get_void_p()
-        if bool(find_handle):
-            return cls._instance_.get(find_handle.value)
+        if not bool(find_handle):
+            current = None
         else:
-            return None
+            current = cls._instance_.get(find_handle.value, _UNKNOWN)
+            if current is _UNKNOWN:
+                # A context quickwindow does not own; never cache it
+                return None
+        Window._contexts_.current = _context_ref(current)
+        return current
+
+    @property
+    def closed(self):
+        return self.handle is None
+
+    # Makes the window current for the block and closes it afterwards
+    @contextmanager
+    def closing(self):
+        try:
+            with self:
+                yield self
+        finally:
+            self.close()
 
     def close(self):
-        api.glfwDestroyWindow(self.handle)
+        if self.handle is None:
+            return
+        self._close_presenter()
+        current = getattr(Window._contexts_, 'current', _UNKNOWN)
+        if current is not _UNKNOWN and current() is self:
+            Window._contexts_.current = _no_context
+        self._finalizer()
+        self._drop_callbacks()
+        self.__dict__.pop('_clipboard', None)
+        self.handle = None
+
+    def _close_presenter(self):
+        presenter = self.__dict__.pop('_presenter', None)
+        if presenter is not None:
+            presenter.close()
+
+    # The ctypes callback objects shadow the set_*_callback methods
+    def _drop_callbacks(self):
+        for name in [name for name in self.__dict__ if name.startswith('set_') and name.endswith('_callback')]:
+            del self.__dict__[name]
+
+    _callback_setters_ = (api.glfwSetKeyCallback, api.glfwSetCharCallback, api.glfwSetScrollCallback,
+                          api.glfwSetCursorEnterCallback, api.glfwSetCursorPosCallback,
+                          api.glfwSetMouseButtonCallback, api.glfwSetWindowPosCallback,
+                          api.glfwSetWindowSizeCallback, api.glfwSetWindowCloseCallback,
+                          api.glfwSetWindowRefreshCallback, api.glfwSetWindowFocusCallback,
+                          api.glfwSetWindowIconifyCallback, api.glfwSetFramebufferSizeCallback)
+
+    # Detaches every callback so the window can be handed to a new owner;
+    # the presenter goes too and present() builds a fresh one on demand
+    def reset(self):
+        self._close_presenter()
+        for setter in Window._callback_setters_:
+            setter(self.handle, None)
+        self._drop_callbacks()
+        self.should_close = False
 
     @property
     def should_close(self):
@@ -425,12 +800,23 @@ class Window(WindowType):
     def swap_buffers(self):
         api.glfwSwapBuffers(self.handle)
 
+    def present(self, buffer, width: Optional[int] = None, height: Optional[int] = None):
+        presenter = self.__dict__.get('_presenter')
+        if presenter is None:
+            from .present import FramePresenter
+            presenter = self._presenter = FramePresenter(self)
+        with self:
+            presenter.present(buffer, width, height)
+
     def swap_interval(self, interval):
+        if self.__dict__.get('_swap_interval') == interval:
+            return
         with self:
             api.glfwSwapInterval(interval)
+        self._swap_interval = interval
 
     def set_title(self, title):
-        api.glfwSetWindowTitle(self.handle, title)
+        api.glfwSetWindowTitle(self.handle, _utf(title))
 
     @property
     def framebuffer_size(self):
@@ -556,9 +942,19 @@ class Window(WindowType):
 
         if not hints._hints:
             api.glfwDefaultWindowHints()
+            Window._hints_.clear()
 
         for hint, value in hints._hints.items():
             api.glfwWindowHint(hint, value)
+        Window._hints_.update(hints._hints)
+
+    # GLFW cannot report its hints, so the ones set through hint() since the
+    # last reset are mirrored here for code that must restore them
+    @staticmethod
+    def current_hints():
+        hints = Hints()
+        hints._hints.update(Window._hints_)
+        return hints
 
     @property
     def monitor(self):
@@ -568,13 +964,20 @@ class Window(WindowType):
         else:
             return None
 
+    @property
+    def clipboard_manager(self):
+        manager = self.__dict__.get('_clipboard')
+        if manager is None:
+            manager = self._clipboard = Clipboard(self, cached=False)
+        return manager
+
     @property
     def clipboard(self):
-        return _str(api.glfwGetClipboardString(self.handle))
+        return self.clipboard_manager.value
 
     @clipboard.setter
     def clipboard(self, buffer):
-        api.glfwSetClipboardString(self.handler, _utf(buffer))
+        self.clipboard_manager.value = buffer
 
     _cursor_modes_get = {
         api.GLFW_CURSOR_DISABLED: None,
@@ -639,7 +1042,8 @@ class Window(WindowType):
 
         def wrap(handle, *args, **kwargs):
             window = cls._instance_.get(handle.get_void_p().value, None)
-            func(window, *args, **kwargs)
+            if window is not None:
+                func(window, *args, **kwargs)
         return functype(wrap)
 
     def set_key_callback(self, callback):
@@ -653,6 +1057,10 @@ class Window(WindowType):
         self.set_char_callback = self._wcb(api.GLFWcharfun, wrap)
         api.glfwSetCharCallback(self.handle, self.set_char_callback)
 
+    def set_codepoint_callback(self, callback):
+        self.set_codepoint_callback = self._wcb(api.GLFWcharfun, callback)
+        api.glfwSetCharCallback(self.handle, self.set_codepoint_callback)
+
     def set_scroll_callback(self, callback):
         self.set_scroll_callback = self._wcb(api.GLFWscrollfun, callback)
         api.glfwSetScrollCallback(self.handle, self.set_scroll_callback)
@@ -710,6 +1118,7 @@ class Window(WindowType):
         callback_map = {
             'key': self.set_key_callback,
             'char': self.set_char_callback,
+            'codepoint': self.set_codepoint_callback,
             'scroll': self.set_scroll_callback,
             'cursor_enter': self.set_cursor_enter_callback,
             'cursor_pos': self.set_cursor_pos_callback,
@@ -744,29 +1153,139 @@ class Window(WindowType):
     def wait_events():
         api.glfwWaitEvents()
 
+    # Safe to call from any thread; wakes a blocked wait_events()
+    @staticmethod
+    def post_empty_event():
+        api.glfwPostEmptyEvent()
+
     def quit(self):
         self.should_close = True
 
 class ManagedWindow(Window):
-    def __init__(self, *args, quit_key: Optional[Keys] = None, **kwargs):
+    def __init__(self, *args, quit_key: Optional[Keys] = None, char_events: bool = False, **kwargs):
         if "callbacks" in kwargs.keys():
             del kwargs["callbacks"]
         super().__init__(*args, **kwargs)
-        self.set_key_callback(ManagedWindow.key_callback)
-        self.set_char_callback(ManagedWindow.char_callback)
-        self.set_scroll_callback(ManagedWindow.scroll_callback)
-        self.set_mouse_button_callback(ManagedWindow.mouse_button_callback)
-        self.set_cursor_enter_callback(ManagedWindow.cursor_enter_callback)
-        self.set_cursor_pos_callback(ManagedWindow.cursor_pos_callback)
-        self.set_window_size_callback(ManagedWindow.window_size_callback)
-        self.set_window_pos_callback(ManagedWindow.window_pos_callback)
-        self.set_window_close_callback(ManagedWindow.window_close_callback)
-        self.set_window_refresh_callback(ManagedWindow.window_refresh_callback)
-        self.set_window_focus_callback(ManagedWindow.window_focus_callback)
-        self.set_window_iconify_callback(ManagedWindow.window_iconify_callback)
-        self.set_framebuffer_size_callback(ManagedWindow.framebuffer_size_callback)
+        self._text = array('I')
+        self._text_str = ''
+        self.char_events = char_events
+        self._install_callbacks()
         self._events = Queue()
+        self._posted = deque()
+        # Events routed by the dispatcher, kept only for the latency tracker
+        self._dispatched = []
         self._quit_key = quit_key
+        self._listeners = []
+        self.frame = 0
+        self.joysticks = None
+        self.latency = None
+        self.dispatcher = None
+        self._clipboard = Clipboard(self)
+
+    # Called through Window so that a thunk left on the instance by a
+    # previous owner cannot shadow the setter
+    def _install_callbacks(self):
+        Window.set_key_callback(self, ManagedWindow.key_callback)
+        Window.set_codepoint_callback(self, ManagedWindow.codepoint_callback)
+        Window.set_scroll_callback(self, ManagedWindow.scroll_callback)
+        Window.set_mouse_button_callback(self, ManagedWindow.mouse_button_callback)
+        Window.set_cursor_enter_callback(self, ManagedWindow.cursor_enter_callback)
+        Window.set_cursor_pos_callback(self, ManagedWindow.cursor_pos_callback)
+        Window.set_window_size_callback(self, ManagedWindow.window_size_callback)
+        Window.set_window_pos_callback(self, ManagedWindow.window_pos_callback)
+        Window.set_window_close_callback(self, ManagedWindow.window_close_callback)
+        Window.set_window_refresh_callback(self, ManagedWindow.window_refresh_callback)
+        Window.set_window_focus_callback(self, ManagedWindow.window_focus_callback)
+        Window.set_window_iconify_callback(self, ManagedWindow.window_iconify_callback)
+        Window.set_framebuffer_size_callback(self, ManagedWindow.framebuffer_size_callback)
+
+    @override
+    def close(self):
+        if self.handle is None:
+            return
+        self.disable_joysticks()
+        super().close()
+        self._clear_state()
+
+    # Reinstalls the managed callbacks over anything a previous owner set
+    # and drops whatever it attached or left queued
+    @override
+    def reset(self):
+        super().reset()
+        self._install_callbacks()
+        self.disable_joysticks()
+        self._clear_state()
+        self.clipboard_manager.invalidate()
+
+    def _clear_state(self):
+        self._events = Queue()
+        self._posted.clear()
+        self._dispatched.clear()
+        self._listeners.clear()
+        self.dispatcher = None
+        self.latency = None
+        del self._text[:]
+        self._text_str = ''
+        self.frame = 0
+
+    def enable_latency_tracking(self, capacity: int = 4096) -> LatencyTracker:
+        if self.latency is None:
+            self.latency = LatencyTracker(capacity)
+        return self.latency
+
+    def disable_latency_tracking(self):
+        self.latency = None
+        self._dispatched.clear()
+
+    def enable_joysticks(self, rate: Optional[Union[int, float]] = None, threshold: float = 0.0):
+        if self.joysticks is None:
+            self.joysticks = JoystickPoller(self.__add_event, rate, threshold)
+        return self.joysticks
+
+    def disable_joysticks(self):
+        if self.joysticks is not None:
+            self.joysticks.close()
+            self.joysticks = None
+
+    @override
+    def poll_events(self):
+        api.glfwPollEvents()
+        if self.joysticks is not None:
+            self.joysticks.poll()
+        if self._posted:
+            self._drain_posted()
+
+    @override
+    def wait_events(self):
+        if self._posted:
+            api.glfwPollEvents()
+        else:
+            api.glfwWaitEvents()
+        if self.joysticks is not None:
+            self.joysticks.poll()
+        if self._posted:
+            self._drain_posted()
+
+    # Thread-safe: the object is handed to the main thread on its next
+    # poll_events()/wait_events() and a blocked wait_events() is woken up
+    def post_event(self, event):
+        self._posted.append(event)
+        api.glfwPostEmptyEvent()
+
+    def _drain_posted(self):
+        posted = self._posted
+        while posted:
+            event = posted.popleft()
+            if isinstance(event, EventType):
+                self.__add_event(event)
+            else:
+                self.__add_custom_event(event)
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
 
     def events(self):
         while not self._events.empty():
@@ -776,13 +1295,46 @@ class ManagedWindow(Window):
     def all_events(self):
         return list(self._events.queue)
 
+    @property
+    def text(self):
+        if self._text_str is None:
+            self._text_str = self._text.tobytes().decode(_utf32)
+        return self._text_str
+
     @override
     def swap_buffers(self):
         api.glfwSwapBuffers(self.handle)
+        if self.latency is not None:
+            self.latency.frame(chain(self._events.queue, self._dispatched), perf_counter())
+            if self._dispatched:
+                self._dispatched.clear()
         self._events = Queue()
+        if self._text:
+            del self._text[:]
+            self._text_str = ''
+        self.frame += 1
 
     def __add_event(self, event: EventType):
-        self._events.put(event)
+        event.timestamp = perf_counter()
+        dispatcher = self.dispatcher
+        # Events with a registered handler are routed immediately and never queued
+        if dispatcher is None or not dispatcher.dispatch(event):
+            self._events.put(event)
+        elif self.latency is not None:
+            self._dispatched.append(event)
+        if self._listeners:
+            for listener in self._listeners:
+                listener(self, event)
+
+    # Posted objects need not be EventTypes, so they are neither stamped
+    # nor assumed to accept new attributes
+    def __add_custom_event(self, event):
+        dispatcher = self.dispatcher
+        if dispatcher is None or not dispatcher.dispatch(event):
+            self._events.put(event)
+        if self._listeners:
+            for listener in self._listeners:
+                listener(self, event)
 
     def key_callback(self, key, scancode, action, mods):
         if self._quit_key is not None and key == self._quit_key and action == api.GLFW_PRESS:
@@ -792,8 +1344,18 @@ class ManagedWindow(Window):
                                   action=action,
                                   mods=mods))
 
+    def codepoint_callback(self, codepoint):
+        self._text.append(codepoint)
+        self._text_str = None
+        if self.char_events:
+            self.__add_event(CharEvent(char=_unichr(codepoint)))
+        elif self._listeners:
+            event = CharEvent(char=_unichr(codepoint), timestamp=perf_counter())
+            for listener in self._listeners:
+                listener(self, event)
+
     def char_callback(self, char):
-        self.__add_event(CharEvent(char=char))
+        self.codepoint_callback(ord(char))
 
     def scroll_callback(self, off_x, off_y):
         self.__add_event(ScrollEvent(dx=off_x,
@@ -826,6 +1388,8 @@ class ManagedWindow(Window):
         self.__add_event(WindowRefreshEvent())
 
     def window_focus_callback(self, status):
+        if status:
+            self.clipboard_manager.invalidate()
         self.__add_event(WindowFocusEvent(status=status))
 
     def window_iconify_callback(self, status):
@@ -843,6 +1407,14 @@ class FrameLimiter:
         self.frame_current_time = self.frame_prev_time
         self.frame_count = 0
         self.frame_accum = 0
+        self.frame_wait = 0.0
+        self.late_latch = False
+        self.latch_margin = 0.001
+        self.work_estimate = 0.0
+        self._work_mean = 0.0
+        self._work_dev = 0.0
+        self._deadline = None
+        self._latch_time = None
 
     @property
     def frame_limit(self):
@@ -851,6 +1423,7 @@ class FrameLimiter:
     def set_frame_limit(self, limit: Optional[Union[str, int]]):
         self._frame_limit = limit
         self.frame_step = 0 if self._frame_limit is None else 1.0 / self._frame_limit
+        self.frame_wait = 0.0
 
     def limit(self):
         self.frame_prev_time = self.frame_current_time
@@ -864,4 +1437,42 @@ class FrameLimiter:
                 self.frame_count = 0
             while api.glfwGetTime() < self.frame_current_time + self.frame_step:
                 pass
-        return dt
\ No newline at end of file
+            self.frame_wait = api.glfwGetTime() - self.frame_current_time
+        return dt
+
+    def set_late_latch(self, enabled: bool = True, margin: float = 0.001):
+        self.late_latch = enabled
+        self.latch_margin = margin
+        self._deadline = None
+
+    # Late-latch pacing: sleep first, wake just early enough that the learned
+    # render cost still meets the frame deadline, then let the caller poll
+    def latch(self):
+        if self.frame_limit is None:
+            return self.limit()
+        now = api.glfwGetTime()
+        if self._deadline is None:
+            self._deadline = now + self.frame_step
+        wake = self._deadline - self.work_estimate - self.latch_margin
+        if wake - now > 0.002:
+            sleep(wake - now - 0.002)
+        while api.glfwGetTime() < wake:
+            pass
+        self.frame_prev_time = self.frame_current_time
+        self.frame_current_time = self._latch_time = api.glfwGetTime()
+        self.frame_wait = self.frame_current_time - now
+        return self.frame_current_time - self.frame_prev_time
+
+    def finish_frame(self):
+        if self._latch_time is None:
+            return
+        now = api.glfwGetTime()
+        work = now - self._latch_time
+        self._latch_time = None
+        self._work_mean += (work - self._work_mean) * 0.1
+        self._work_dev += (abs(work - self._work_mean) - self._work_dev) * 0.1
+        self.work_estimate = min(self._work_mean + 2.0 * self._work_dev, self.frame_step)
+        self._deadline += self.frame_step
+        if now > self._deadline:
+            # Missed the deadline: resynchronise instead of trying to catch up
+            self._deadline = now + self.frame_step
\ No newline at end of file